@@ -19,9 +19,7 @@ import warnings
 
 import empyrical as ep
 from pandas.tseries.offsets import BDay
-from scipy import stats
-from statsmodels.regression.linear_model import OLS
-from statsmodels.tools.tools import add_constant
+from scipy import sparse
 from . import utils
 
 
@@ -53,25 +51,61 @@ def factor_information_coefficient(factor_data,
         provided forward returns.
     """
 
-    def src_ic(group):
-        f = group['factor']
-        _ic = group[utils.get_forward_returns_columns(factor_data.columns)] \
-            .apply(lambda x: stats.spearmanr(x, f)[0])
-        return _ic
-
-    factor_data = factor_data.copy()
-
+    #
+    # Spearman correlation is the Pearson correlation of the ranks: factor
+    # and returns are ranked inside each (date[, group]) segment and the
+    # correlations of all the segments are computed with bincount sums
+    #
     grouper = [factor_data.index.get_level_values('date')]
+    names = ['date']
+    if by_group:
+        grouper.append(factor_data['group'].values)
+        names.append('group')
+    codes, keys = _factorize_keys(grouper)
+    num_segments = len(keys[0])
 
     if group_adjust:
-        factor_data = utils.demean_forward_returns(factor_data,
-                                                   grouper + ['group'])
+        returns = utils.demeaned_forward_returns(factor_data, group_adjust)
+    else:
+        returns = factor_data[
+            utils.get_forward_returns_columns(factor_data.columns)]
+
+    factor_ranks = factor_data['factor'].groupby(codes).rank().values
+    returns_ranks = returns.groupby(codes).rank().values
+
+    ic = np.stack([_segment_corr(factor_ranks, returns_ranks[:, i],
+                                 codes, num_segments)
+                   for i in range(returns_ranks.shape[1])], axis=1)
+
     if by_group:
-        grouper.append('group')
+        index = pd.MultiIndex.from_arrays(keys, names=names)
+    else:
+        index = pd.Index(keys[0], name='date')
 
-    ic = factor_data.groupby(grouper).apply(src_ic)
+    return pd.DataFrame(ic, index=index, columns=returns.columns)
 
-    return ic
+
+def _segment_corr(x, y, codes, num_segments):
+    """
+    Segmented Pearson correlation between 'x' and 'y'. As scipy.stats does,
+    segments containing a NaN have a NaN correlation.
+    """
+    missing = np.bincount(codes, weights=np.isnan(x) | np.isnan(y),
+                          minlength=num_segments)
+    x = np.where(np.isnan(x), 0., x)
+    y = np.where(np.isnan(y), 0., y)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = x - _group_mean(x, codes)
+        y = y - _group_mean(y, codes)
+        corr = np.bincount(codes, weights=x * y, minlength=num_segments) \
+            / np.sqrt(np.bincount(codes, weights=x ** 2,
+                                  minlength=num_segments)
+                      * np.bincount(codes, weights=y ** 2,
+                                    minlength=num_segments))
+
+    corr[missing > 0] = np.nan
+    return corr
 
 
 def mean_information_coefficient(factor_data,
@@ -166,43 +200,102 @@ def factor_weights(factor_data,
         Assets weighted by factor value.
     """
 
-    def to_weights(group, _demeaned, _equal_weight):
+    def to_weights(values, codes, _demeaned, _equal_weight):
 
         if _equal_weight:
-            group = group.copy()
 
             if _demeaned:
                 # top assets positive weights, bottom ones negative
-                group = group - group.median()
+                median = pd.Series(values).groupby(codes).transform('median')
+                values = values - median.values
 
-            negative_mask = group < 0
-            group[negative_mask] = -1.0
-            positive_mask = group > 0
-            group[positive_mask] = 1.0
+            negative_mask = values < 0
+            positive_mask = values > 0
+            values = np.where(negative_mask, -1.0, values)
+            values = np.where(positive_mask, 1.0, values)
 
             if _demeaned:
                 # positive weights must equal negative weights
-                if negative_mask.any():
-                    group[negative_mask] /= negative_mask.sum()
-                if positive_mask.any():
-                    group[positive_mask] /= positive_mask.sum()
+                values = np.where(
+                    negative_mask,
+                    values / _group_sum(negative_mask, codes), values)
+                values = np.where(
+                    positive_mask,
+                    values / _group_sum(positive_mask, codes), values)
 
         elif _demeaned:
-            group = group - group.mean()
+            values = values - _group_mean(values, codes)
 
-        return group / group.abs().sum()
+        return values / _group_sum(np.abs(values), codes)
 
-    grouper = [factor_data.index.get_level_values('date')]
+    date_codes = _group_codes([factor_data.index.get_level_values('date')])
     if group_adjust:
-        grouper.append('group')
+        codes = _group_codes([factor_data.index.get_level_values('date'),
+                              factor_data['group']])
+    else:
+        codes = date_codes
 
-    weights = factor_data.groupby(grouper)['factor'] \
-        .apply(to_weights, demeaned, equal_weight)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = to_weights(factor_data['factor'].values.astype(np.float64),
+                             codes, demeaned, equal_weight)
 
-    if group_adjust:
-        weights = weights.groupby(level='date').apply(to_weights, False, False)
+        if group_adjust:
+            weights = to_weights(weights, date_codes, False, False)
+
+    return pd.Series(weights, index=factor_data.index, name='factor')
 
-    return weights
+
+def _group_codes(keys):
+    """
+    Encodes the rows of one or more aligned key arrays into dense integer
+    group codes, ordered as the sorted keys.
+    """
+    codes, _ = _factorize_keys(keys)
+    return codes
+
+
+def _factorize_keys(keys):
+    """
+    Encodes the rows of one or more aligned key arrays into dense integer
+    codes, ordered as the sorted keys, and returns them together with the
+    key values of every code (one array per key). Missing keys raise a
+    ValueError: their rows would be mixed into neighbouring codes.
+    """
+    codes = np.zeros(len(keys[0]), dtype=np.int64)
+    uniques = []
+    for key in keys:
+        key_codes, key_uniques = pd.factorize(key, sort=True)
+        if (key_codes < 0).any():
+            raise ValueError("Group keys contain missing values (e.g. NaN "
+                             "'group'), drop or fill them first")
+        codes = codes * len(key_uniques) + key_codes
+        uniques.append(key_uniques)
+
+    if len(keys) == 1:
+        return codes, uniques
+
+    combined, codes = np.unique(codes, return_inverse=True)
+    values = []
+    for key_uniques in reversed(uniques):
+        values.append(key_uniques[combined % len(key_uniques)])
+        combined = combined // len(key_uniques)
+    return codes, values[::-1]
+
+
+def _group_sum(values, codes):
+    """
+    Segmented sum of 'values' broadcast back to every row, NaNs are skipped.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = np.where(np.isnan(values), 0., values)
+    return np.bincount(codes, weights=values)[codes]
+
+
+def _group_mean(values, codes):
+    """
+    Segmented mean of 'values' broadcast back to every row, NaNs are skipped.
+    """
+    return _group_sum(values, codes) / _group_sum(~np.isnan(values), codes)
 
 
 def factor_returns(factor_data,
@@ -243,14 +336,28 @@ def factor_returns(factor_data,
     weights = \
         factor_weights(factor_data, demeaned, group_adjust, equal_weight)
 
-    weighted_returns = \
-        factor_data[utils.get_forward_returns_columns(factor_data.columns)] \
-        .multiply(weights, axis=0)
+    fwd_ret_cols = utils.get_forward_returns_columns(factor_data.columns)
 
     if by_asset:
-        returns = weighted_returns
-    else:
-        returns = weighted_returns.groupby(level='date').sum()
+        return factor_data[fwd_ret_cols].multiply(weights, axis=0)
+
+    #
+    # every period returns come from a single (date x asset) sparse weights
+    # matrix multiplied by the (asset x period) forward returns matrix
+    #
+    date_codes, dates = pd.factorize(
+        factor_data.index.get_level_values('date'), sort=True)
+    weights = np.nan_to_num(weights.values, nan=0.)
+    fwd_returns = factor_data[fwd_ret_cols].values.astype(np.float64)
+    fwd_returns = np.where(np.isnan(fwd_returns), 0., fwd_returns)
+
+    weights_matrix = sparse.csr_matrix(
+        (weights, (date_codes, np.arange(len(date_codes)))),
+        shape=(len(dates), len(date_codes)))
+
+    returns = pd.DataFrame(weights_matrix.dot(fwd_returns),
+                           index=pd.Index(dates, name='date'),
+                           columns=fwd_ret_cols)
 
     return returns
 
@@ -259,7 +366,9 @@ def factor_alpha_beta(factor_data,
                       returns=None,
                       demeaned=True,
                       group_adjust=False,
-                      equal_weight=False):
+                      equal_weight=False,
+                      cov_type=None,
+                      maxlags=None):
     """
     Compute the alpha (excess returns), alpha t-stat (alpha significance),
     and beta (market exposure) of a factor. A regression is run with
@@ -288,12 +397,20 @@ def factor_alpha_beta(factor_data,
     equal_weight : bool, optional
         Control how to build factor returns used for alpha/beta computation
         -- see performance.factor_return for a full explanation
+    cov_type : str, optional
+        If set, the alpha and beta t-stats are also computed. 'nonrobust'
+        uses the OLS standard errors, 'HAC' uses heteroskedasticity and
+        autocorrelation robust (Newey-West) standard errors.
+    maxlags : int, optional
+        Number of lags used by the 'HAC' standard errors. By default
+        floor(4 * (nobs / 100) ** (2 / 9)) is used, nobs being the number of
+        valid observations of each period.
 
     Returns
     -------
-    alpha_beta : pd.Series
-        A list containing the alpha, beta, a t-stat(alpha)
-        for the given factor and forward returns.
+    alpha_beta : pd.DataFrame
+        A DataFrame containing the alpha, beta and (if 'cov_type' is set)
+        the alpha and beta t-stats for the given factor and forward returns.
     """
 
     if returns is None:
@@ -308,28 +425,91 @@ def factor_alpha_beta(factor_data,
         returns.name = universe_ret.columns.values[0]
         returns = pd.DataFrame(returns)
 
-    alpha_beta = pd.DataFrame()
-    for period in returns.columns.values:
-        x = universe_ret[period].values
-        y = returns[period].values
-        x = add_constant(x)
-
-        reg_fit = OLS(y, x).fit()
-        try:
-            alpha, beta = reg_fit.params
-        except ValueError:
-            alpha_beta.loc['Ann. alpha', period] = np.nan
-            alpha_beta.loc['beta', period] = np.nan
-        else:
-            freq_adjust = pd.Timedelta('250Days') / pd.Timedelta(period)
+    periods = returns.columns
+    x = universe_ret[periods].values.astype(np.float64)
+    y = returns.values.astype(np.float64)
 
-            alpha_beta.loc['Ann. alpha', period] = \
-                (1 + alpha) ** freq_adjust - 1
-            alpha_beta.loc['beta', period] = beta
+    #
+    # all periods are solved together in closed form from moment sums, rows
+    # with a missing value are left out of the regression of that period
+    #
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, 0.)
+    y = np.where(valid, y, 0.)
+    nobs = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = x.sum(axis=0) / nobs
+        y_mean = y.sum(axis=0) / nobs
+        x_dev = np.where(valid, x - x_mean, 0.)
+        y_dev = np.where(valid, y - y_mean, 0.)
+        sxx = (x_dev ** 2).sum(axis=0)
+        beta = (x_dev * y_dev).sum(axis=0) / sxx
+        alpha = y_mean - beta * x_mean
+
+        # a constant universe return can't be regressed on
+        undefined = ~(sxx > 0)
+        alpha[undefined] = np.nan
+        beta[undefined] = np.nan
+
+        freq_adjust = np.array([pd.Timedelta('250Days') / pd.Timedelta(p)
+                                for p in periods])
+
+        alpha_beta = pd.DataFrame([(1 + alpha) ** freq_adjust - 1, beta],
+                                  index=['Ann. alpha', 'beta'],
+                                  columns=periods)
+
+        if cov_type is not None:
+            resid = np.where(valid, y_dev - beta * x_dev, 0.)
+            std_err = _alpha_beta_std_err(x, resid, valid, cov_type, maxlags)
+            alpha_beta.loc['alpha t-stat'] = alpha / std_err[0]
+            alpha_beta.loc['beta t-stat'] = beta / std_err[1]
 
     return alpha_beta
 
 
+def _alpha_beta_std_err(x, resid, valid, cov_type, maxlags):
+    """
+    Standard errors of the (alpha, beta) regressions of factor_alpha_beta,
+    computed for every period (column of 'x') at once.
+    """
+    nobs = valid.sum(axis=0)
+    ones = valid.astype(np.float64)
+
+    # (period, 2, 2) inverse of the regressors moment matrix [1, x]
+    xtx = np.empty((x.shape[1], 2, 2))
+    xtx[:, 0, 0] = nobs
+    xtx[:, 0, 1] = xtx[:, 1, 0] = x.sum(axis=0)
+    xtx[:, 1, 1] = (x ** 2).sum(axis=0)
+    bread = np.linalg.pinv(xtx)
+
+    if cov_type == 'nonrobust':
+        sigma2 = (resid ** 2).sum(axis=0) / (nobs - 2)
+        cov = bread * sigma2[:, None, None]
+
+    elif cov_type == 'HAC':
+        # Newey-West rule of thumb on the valid observations of each period
+        if maxlags is None:
+            maxlags = np.floor(4 * (nobs / 100.) ** (2. / 9.)).astype(int)
+        else:
+            maxlags = np.full(x.shape[1], maxlags)
+
+        # per period scores of the constant and of the universe return
+        scores = np.stack([resid * ones, resid * x], axis=2)
+        meat = np.einsum('tpi,tpj->pij', scores, scores)
+        for lag in range(1, maxlags.max(initial=0) + 1):
+            gamma = np.einsum('tpi,tpj->pij', scores[lag:], scores[:-lag])
+            weight = np.where(lag <= maxlags, 1 - lag / (maxlags + 1.), 0.)
+            meat += weight[:, None, None] * \
+                (gamma + gamma.transpose(0, 2, 1))
+        cov = np.einsum('pij,pjk,pkl->pil', bread, meat, bread)
+
+    else:
+        raise ValueError("cov_type must be None, 'nonrobust' or 'HAC'")
+
+    return np.sqrt(cov[:, 0, 0]), np.sqrt(cov[:, 1, 1])
+
+
 def cumulative_returns(returns):
     """
     Computes cumulative returns from simple daily returns.
@@ -368,7 +548,7 @@ def positions(weights, period, freq=None):
         Assets holding period (1 day, 2 mins, 3 hours etc). It can be a
         Timedelta or a string in the format accepted by Timedelta constructor
         ('1 days', '1D', '30m', '3h', '1D1h', etc)
-    freq : pandas DateOffset, optional
+    freq : pandas DateOffset or utils.TradingCalendar, optional
         Used to specify a particular trading calendar. If not present
         weights.index.freq will be used
 
@@ -409,43 +589,29 @@ def positions(weights, period, freq=None):
     weights_idx = trades_idx.union(returns_idx)
 
     #
-    # Compute portfolio weights for each point in time contained in the index
+    # The weights traded at trades_idx[i] are held until returns_idx[i], so
+    # the sub-portfolios active at each point in time are a contiguous range
+    # of weights rows and the portfolio weights are computed summing shifted
+    # copies of the weights panel, one copy for each overlapping portfolio
     #
-    portfolio_weights = pd.DataFrame(index=weights_idx,
-                                     columns=weights.columns)
-    active_weights = []
+    last_active = trades_idx.searchsorted(weights_idx, side='right')
+    first_active = returns_idx.searchsorted(weights_idx, side='right')
+    num_active = last_active - first_active
 
-    for curr_time in weights_idx:
+    trades_weights = weights.values.astype(np.float64)
+    trades_weights = np.where(np.isnan(trades_weights), 0., trades_weights)
 
-        #
-        # fetch new weights that become available at curr_time and store them
-        # in active weights
-        #
-        if curr_time in weights.index:
-            assets_weights = weights.loc[curr_time]
-            expire_ts = utils.add_custom_calendar_timedelta(curr_time,
-                                                            period, freq)
-            active_weights.append((expire_ts, assets_weights))
+    tot_weights = np.zeros((len(weights_idx), len(weights.columns)))
+    for shift in range(int(num_active.max(initial=0))):
+        active = num_active > shift
+        tot_weights[active] += trades_weights[last_active[active] - 1 - shift]
 
-        #
-        # remove expired entry in active_weights (older than 'period')
-        #
-        if active_weights:
-            expire_ts, assets_weights = active_weights[0]
-            if expire_ts <= curr_time:
-                active_weights.pop(0)
-
-        if not active_weights:
-            continue
-        #
-        # Compute total weights for curr_time and store them
-        #
-        tot_weights = [w for (ts, w) in active_weights]
-        tot_weights = pd.concat(tot_weights, axis=1)
-        tot_weights = tot_weights.sum(axis=1)
-        tot_weights /= tot_weights.abs().sum()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tot_weights /= np.abs(tot_weights).sum(axis=1, keepdims=True)
 
-        portfolio_weights.loc[curr_time] = tot_weights
+    portfolio_weights = pd.DataFrame(tot_weights,
+                                     index=weights_idx,
+                                     columns=weights.columns)
 
     return portfolio_weights.fillna(0)
 
@@ -484,37 +650,97 @@ def mean_return_by_quantile(factor_data,
         Standard error of returns by specified quantile.
     """
 
-    if group_adjust:
-        grouper = [factor_data.index.get_level_values('date')] + ['group']
-        factor_data = utils.demean_forward_returns(factor_data, grouper)
-    elif demeaned:
-        factor_data = utils.demean_forward_returns(factor_data)
-    else:
-        factor_data = factor_data.copy()
+    return mean_return_by_quantile_multi(
+        factor_data,
+        aggregations=[(by_date, by_group)],
+        demeaned=demeaned,
+        group_adjust=group_adjust,
+    )[(by_date, by_group)]
 
-    grouper = ['factor_quantile', factor_data.index.get_level_values('date')]
 
-    if by_group:
-        grouper.append('group')
+def mean_return_by_quantile_multi(factor_data,
+                                  aggregations=((False, False),
+                                                (True, False)),
+                                  demeaned=True,
+                                  group_adjust=False):
+    """
+    Computes several mean_return_by_quantile aggregations at once. The
+    (factor_quantile, date, group) keys are encoded into integer codes a
+    single time and every requested aggregation is obtained with segmented
+    bincount reductions on the forward returns array.
 
-    group_stats = factor_data.groupby(grouper)[
-        utils.get_forward_returns_columns(factor_data.columns)] \
-        .agg(['mean', 'std', 'count'])
+    Parameters
+    ----------
+    factor_data : pd.DataFrame - MultiIndex
+        A MultiIndex DataFrame indexed by date (level 0) and asset (level 1),
+        containing the values for a single alpha factor, forward returns for
+        each period, the factor quantile/bin that factor value belongs to, and
+        (optionally) the group the asset belongs to.
+        - See full explanation in utils.get_clean_factor_and_forward_returns
+    aggregations : sequence[tuple]
+        (by_date, by_group) pairs to compute
+        -- see performance.mean_return_by_quantile for a full explanation
+    demeaned : bool
+        Compute demeaned mean returns (long short portfolio)
+    group_adjust : bool
+        Returns demeaning will occur on the group level.
 
-    mean_ret = group_stats.T.xs('mean', level=1).T
+    Returns
+    -------
+    mean_returns : dict
+        (mean_ret, std_error_ret) keyed by (by_date, by_group), see
+        performance.mean_return_by_quantile for the format of the values.
+    """
 
-    if not by_date:
-        grouper = [mean_ret.index.get_level_values('factor_quantile')]
-        if by_group:
-            grouper.append(mean_ret.index.get_level_values('group'))
-        group_stats = mean_ret.groupby(grouper)\
-            .agg(['mean', 'std', 'count'])
-        mean_ret = group_stats.T.xs('mean', level=1).T
+    fwd_ret_cols = utils.get_forward_returns_columns(factor_data.columns)
 
-    std_error_ret = group_stats.T.xs('std', level=1).T \
-        / np.sqrt(group_stats.T.xs('count', level=1).T)
+    if group_adjust or demeaned:
+        returns = utils.demeaned_forward_returns(factor_data, group_adjust)
+    else:
+        returns = factor_data[fwd_ret_cols]
+    returns = returns.values.astype(np.float64)
 
-    return mean_ret, std_error_ret
+    cell_keys = [factor_data['factor_quantile'].values,
+                 factor_data.index.get_level_values('date')]
+    if any(by_group for _, by_group in aggregations):
+        cell_keys.append(factor_data['group'].values)
+
+    #
+    # every row is encoded once into its sorted (quantile, date[, group])
+    # cell, coarser aggregations are built mapping cells to their parents
+    #
+    cell_codes, cells = _factorize_keys(cell_keys)
+
+    mean_returns = {}
+    for by_date, by_group in aggregations:
+
+        names = ['factor_quantile', 'date', 'group'][:2 + by_group]
+        date_codes, date_keys = _factorize_keys(cells[:2 + by_group])
+
+        mean_ret, std_ret, count_ret = _segment_nanstats(
+            returns, date_codes[cell_codes], len(date_keys[0]))
+        index = pd.MultiIndex.from_arrays(date_keys, names=names)
+
+        if not by_date:
+            names = ['factor_quantile', 'group'][:1 + by_group]
+            quantile_codes, quantile_keys = _factorize_keys(
+                [date_keys[0]] + date_keys[2:])
+            mean_ret, std_ret, count_ret = _segment_nanstats(
+                mean_ret, quantile_codes, len(quantile_keys[0]))
+            if by_group:
+                index = pd.MultiIndex.from_arrays(quantile_keys, names=names)
+            else:
+                index = pd.Index(quantile_keys[0], name='factor_quantile')
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std_error_ret = std_ret / np.sqrt(count_ret)
+
+        mean_returns[(by_date, by_group)] = (
+            pd.DataFrame(mean_ret, index=index, columns=fwd_ret_cols),
+            pd.DataFrame(std_error_ret, index=index, columns=fwd_ret_cols),
+        )
+
+    return mean_returns
 
 
 def compute_mean_returns_spread(mean_returns,
@@ -585,19 +811,70 @@ def quantile_turnover(quantile_factor, quantile, period=1):
         Period by period turnover for that quantile.
     """
 
-    quant_names = quantile_factor[quantile_factor == quantile]
-    quant_name_sets = quant_names.groupby(level=['date']).apply(
-        lambda x: set(x.index.get_level_values('asset')))
-
-    name_shifted = quant_name_sets.shift(period)
-
-    new_names = (quant_name_sets - name_shifted).dropna()
-    quant_turnover = new_names.apply(
-        lambda x: len(x)) / quant_name_sets.apply(lambda x: len(x))
+    quant_turnover = quantile_turnover_by_period(
+        quantile_factor, [period], quantiles=[quantile])[period][quantile]
     quant_turnover.name = quantile
     return quant_turnover
 
 
+def quantile_turnover_by_period(quantile_factor, periods, quantiles=None):
+    """
+    Computes the turnover of every factor quantile for several periods at
+    once. The date x asset quantile label matrix is built a single time and
+    each turnover is obtained comparing the quantile membership with its
+    shifted copy, so no per date set of names is ever created.
+
+    Parameters
+    ----------
+    quantile_factor : pd.Series
+        DataFrame with date, asset and factor quantile.
+    periods : sequence[int]
+        Number of days over which to calculate the turnover.
+    quantiles : sequence[int], optional
+        Quantiles on which to perform turnover analysis. By default all
+        quantiles in 'quantile_factor' are used.
+
+    Returns
+    -------
+    quant_turnover : dict
+        Period wise turnover DataFrame, dates on the index and quantiles on
+        the columns. See quantile_turnover for more details.
+    """
+
+    if quantiles is None:
+        quantiles = quantile_factor.sort_values().unique().tolist()
+
+    labels = quantile_factor.unstack(level='asset')
+    date_index = labels.index
+    labels = labels.values
+
+    quant_turnover = {period: {} for period in periods}
+    for quantile in quantiles:
+        member = labels == quantile
+        #
+        # dates where the quantile is empty are skipped, periods are counted
+        # on the dates in which the quantile holds at least one name
+        #
+        valid_dates = member.any(axis=1)
+        member = member[valid_dates]
+        counts = member.sum(axis=1)
+        num_dates = len(member)
+
+        for period in periods:
+            turnover = np.full(len(date_index), np.nan)
+            if period < num_dates:
+                new_names = (member[period:] &
+                             ~member[:num_dates - period]).sum(axis=1)
+                valid_turnover = np.full(num_dates, np.nan)
+                valid_turnover[period:] = new_names / counts[period:]
+                turnover[valid_dates] = valid_turnover
+            quant_turnover[period][quantile] = turnover
+
+    return {period: pd.DataFrame(quant_turnover[period], index=date_index,
+                                 columns=quantiles)
+            for period in periods}
+
+
 def factor_rank_autocorrelation(factor_data, period=1):
     """
     Computes autocorrelation of mean factor ranks in specified time spans.
@@ -624,19 +901,65 @@ def factor_rank_autocorrelation(factor_data, period=1):
         Rolling 1 period (defined by time_rule) autocorrelation of
         factor values.
     """
-    grouper = [factor_data.index.get_level_values('date')]
+    autocorr = factor_rank_autocorrelation_by_period(factor_data, [period])
+    return autocorr[period]
 
-    ranks = factor_data.groupby(grouper)['factor'].rank()
 
-    asset_factor_rank = ranks.reset_index().pivot(index='date',
-                                                  columns='asset',
-                                                  values='factor')
+def factor_rank_autocorrelation_by_period(factor_data, periods):
+    """
+    Computes the factor rank autocorrelation for several periods at once.
+    Factor ranks are computed and pivoted to a date x asset panel a single
+    time, then each period autocorrelation is the row wise Pearson
+    correlation between the panel and its shifted copy, using only the
+    assets that have a rank in both rows.
 
-    asset_shifted = asset_factor_rank.shift(period)
+    Parameters
+    ----------
+    factor_data : pd.DataFrame - MultiIndex
+        A MultiIndex DataFrame indexed by date (level 0) and asset (level 1),
+        containing the values for a single alpha factor, forward returns for
+        each period, the factor quantile/bin that factor value belongs to, and
+        (optionally) the group the asset belongs to.
+        - See full explanation in utils.get_clean_factor_and_forward_returns
+    periods: sequence[int]
+        Number of days over which to calculate the turnover.
 
-    autocorr = asset_factor_rank.corrwith(asset_shifted, axis=1)
-    autocorr.name = period
-    return autocorr
+    Returns
+    -------
+    autocorr : pd.DataFrame
+        Period wise autocorrelation of factor ranks, dates on the index and
+        periods on the columns. See factor_rank_autocorrelation for more
+        details.
+    """
+    asset_factor_rank = factor_data['factor'].unstack(level='asset') \
+        .rank(axis=1)
+    ranks = asset_factor_rank.values
+    num_dates = len(ranks)
+
+    autocorr = {}
+    for period in periods:
+        period_autocorr = np.full(num_dates, np.nan)
+        if period < num_dates:
+            curr = ranks[period:]
+            prev = ranks[:num_dates - period]
+            valid = ~(np.isnan(curr) | np.isnan(prev))
+            count = valid.sum(axis=1)
+
+            curr = np.where(valid, curr, 0.)
+            prev = np.where(valid, prev, 0.)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                curr = np.where(valid, curr - curr.sum(axis=1, keepdims=True)
+                                / count[:, None], 0.)
+                prev = np.where(valid, prev - prev.sum(axis=1, keepdims=True)
+                                / count[:, None], 0.)
+                corr = (curr * prev).sum(axis=1) / np.sqrt(
+                    (curr ** 2).sum(axis=1) * (prev ** 2).sum(axis=1))
+            corr[count < 2] = np.nan
+            period_autocorr[period:] = corr
+        autocorr[period] = period_autocorr
+
+    return pd.DataFrame(autocorr, index=asset_factor_rank.index,
+                        columns=list(periods))
 
 
 def common_start_returns(factor,
@@ -688,43 +1011,120 @@ def common_start_returns(factor,
     if not cumulative:
         returns = returns.apply(cumulative_returns, axis=0)
 
-    all_returns = []
+    offsets = np.arange(-before, after + 1)
+
+    # dates not available in returns are skipped
+    date_pos, asset_pos = _event_positions(factor.index, returns)
+    found = date_pos >= 0
+    date_pos, asset_pos = date_pos[found], asset_pos[found]
+    equities = factor.index.get_level_values('asset')[found]
+
+    series = _event_windows(returns.values, date_pos, asset_pos, offsets)
+
+    if demean_by is not None:
+        demean_date_pos, demean_asset_pos = \
+            _event_positions(demean_by.index, returns)
+        demean_found = demean_date_pos >= 0
+        demean_date_pos = demean_date_pos[demean_found]
+        mean = _segment_nanmean(
+            _event_windows(returns.values, demean_date_pos,
+                           demean_asset_pos[demean_found], offsets),
+            demean_date_pos, len(returns.index))
+        series = series - mean[date_pos]
+
+    if mean_by_date:
+        date_codes, dates = pd.factorize(date_pos, sort=True)
+        series = _segment_nanmean(series, date_codes, len(dates))
+        columns = range(len(dates))
+    else:
+        columns = equities
 
-    for timestamp, df in factor.groupby(level='date'):
+    # keep only the offsets at least one event window reaches
+    valid_offsets = _valid_event_offsets(date_pos, offsets,
+                                         len(returns.index))
 
-        equities = df.index.get_level_values('asset')
+    return pd.DataFrame(series.T[valid_offsets],
+                        index=offsets[valid_offsets],
+                        columns=columns)
 
-        try:
-            day_zero_index = returns.index.get_loc(timestamp)
-        except KeyError:
-            continue
 
-        starting_index = max(day_zero_index - before, 0)
-        ending_index = min(day_zero_index + after + 1,
-                           len(returns.index))
+def _event_positions(index, returns):
+    """
+    Locates each (date, asset) entry of 'index' in the wide 'returns' frame,
+    -1 marks a date or an asset not available in 'returns'.
+    """
+    date_pos = returns.index.get_indexer(index.get_level_values('date'))
+    asset_pos = returns.columns.get_indexer(index.get_level_values('asset'))
+    return date_pos, asset_pos
 
-        equities_slice = set(equities)
-        if demean_by is not None:
-            demean_equities = demean_by.loc[timestamp] \
-                .index.get_level_values('asset')
-            equities_slice |= set(demean_equities)
 
-        series = returns.loc[returns.index[starting_index:ending_index],
-                             equities_slice]
-        series.index = range(starting_index - day_zero_index,
-                             ending_index - day_zero_index)
+def _event_windows(returns_values, date_pos, asset_pos, offsets):
+    """
+    Gathers the (event x offset) returns window around every event with a
+    single fancy indexing operation, NaN where a window falls outside the
+    returns data or the event asset is unknown.
+    """
+    rows = date_pos[:, None] + offsets[None, :]
+    valid = (rows >= 0) & (rows < len(returns_values)) \
+        & (asset_pos >= 0)[:, None]
+    windows = returns_values[np.clip(rows, 0, len(returns_values) - 1),
+                             asset_pos[:, None]].astype(np.float64)
+    return np.where(valid, windows, np.nan)
 
-        if demean_by is not None:
-            mean = series.loc[:, demean_equities].mean(axis=1)
-            series = series.loc[:, equities]
-            series = series.sub(mean, axis=0)
 
-        if mean_by_date:
-            series = series.mean(axis=1)
+def _valid_event_offsets(date_pos, offsets, num_dates):
+    """
+    Mask of the offsets reached by the window of at least one event.
+    """
+    rows = np.unique(date_pos)[:, None] + offsets[None, :]
+    return ((rows >= 0) & (rows < num_dates)).any(axis=0)
+
 
-        all_returns.append(series)
+def _segment_nanmean(values, codes, num_segments):
+    """
+    Segmented mean over the rows of 'values' (1-D or 2-D), NaNs are skipped.
+    """
+    if values.ndim == 2:
+        return np.stack([_segment_nanmean(col, codes, num_segments)
+                         for col in values.T], axis=1)
 
-    return pd.concat(all_returns, axis=1)
+    valid = ~np.isnan(values)
+    sums = np.bincount(codes, weights=np.where(valid, values, 0.),
+                       minlength=num_segments)
+    counts = np.bincount(codes, weights=valid, minlength=num_segments)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def _segment_nanstats(values, codes, num_segments):
+    """
+    Segmented mean, sample standard deviation and count of the non NaN
+    values over the rows of the 2-D 'values'.
+    """
+    counts = np.stack([np.bincount(codes, weights=~np.isnan(col),
+                                   minlength=num_segments)
+                       for col in values.T], axis=1)
+    return (_segment_nanmean(values, codes, num_segments),
+            _segment_nanstd(values, codes, num_segments),
+            counts)
+
+
+def _segment_nanstd(values, codes, num_segments):
+    """
+    Segmented sample standard deviation (ddof=1) over the rows of 'values'
+    (1-D or 2-D), NaNs are skipped.
+    """
+    if values.ndim == 2:
+        return np.stack([_segment_nanstd(col, codes, num_segments)
+                         for col in values.T], axis=1)
+
+    valid = ~np.isnan(values)
+    deviation = values - _segment_nanmean(values, codes, num_segments)[codes]
+    squares = np.bincount(codes, weights=np.where(valid, deviation ** 2, 0.),
+                          minlength=num_segments)
+    counts = np.bincount(codes, weights=valid, minlength=num_segments)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
 
 
 def average_cumulative_return_by_quantile(factor_data,
@@ -788,79 +1188,89 @@ def average_cumulative_return_by_quantile(factor_data,
             ---------------------------------------------------
     """
 
-    def cumulative_return_around_event(q_fact, demean_by):
-        return common_start_returns(
-            q_fact,
-            returns,
-            periods_before,
-            periods_after,
-            cumulative=True,
-            mean_by_date=True,
-            demean_by=demean_by,
-        )
+    #
+    # Every (date, asset) event window is gathered from the returns array,
+    # demeaned by the per date (and group, if 'group_adjust') mean window
+    # and averaged per date, quantile and group. Mean and std deviation of
+    # those per date windows are then taken across dates.
+    #
+    offsets = np.arange(-periods_before, periods_after + 1)
 
-    def average_cumulative_return(q_fact, demean_by):
-        q_returns = cumulative_return_around_event(q_fact, demean_by)
-        q_returns.replace([np.inf, -np.inf], np.nan, inplace=True)
+    # dates not available in returns are skipped
+    date_pos, asset_pos = _event_positions(factor_data.index, returns)
+    found = date_pos >= 0
+    factor_data = factor_data[found]
+    date_pos, asset_pos = date_pos[found], asset_pos[found]
 
-        return pd.DataFrame({'mean': q_returns.mean(skipna=True, axis=1),
-                             'std': q_returns.std(skipna=True, axis=1)}).T
+    quantiles = factor_data['factor_quantile'].values
+    if by_group or group_adjust:
+        groups = np.asarray(factor_data['group'])
 
     if by_group:
-        #
-        # Compute quantile cumulative returns separately for each group
-        # Deman those returns accordingly to 'group_adjust' and 'demeaned'
-        #
-        returns_bygroup = []
-
-        for group, g_data in factor_data.groupby('group'):
-            g_fq = g_data['factor_quantile']
-            if group_adjust:
-                demean_by = g_fq  # demeans at group level
-            elif demeaned:
-                demean_by = factor_data['factor_quantile']  # demean by all
-            else:
-                demean_by = None
-            #
-            # Align cumulative return from different dates to the same index
-            # then compute mean and std
-            #
-            avgcumret = g_fq.groupby(g_fq).apply(average_cumulative_return,
-                                                 demean_by)
-            if len(avgcumret) == 0:
-                continue
-
-            avgcumret['group'] = group
-            avgcumret.set_index('group', append=True, inplace=True)
-            returns_bygroup.append(avgcumret)
-
-        return pd.concat(returns_bygroup, axis=0)
+        label_keys = [groups, quantiles]
+    else:
+        label_keys = [quantiles]
 
+    if by_group or group_adjust:
+        segment_keys = [groups, quantiles, date_pos]
     else:
-        #
-        # Compute quantile cumulative returns for the full factor_data
-        # Align cumulative return from different dates to the same index
-        # then compute mean and std
-        # Deman those returns accordingly to 'group_adjust' and 'demeaned'
-        #
-        if group_adjust:
-            all_returns = []
-            for group, g_data in factor_data.groupby('group'):
-                g_fq = g_data['factor_quantile']
-                avgcumret = g_fq.groupby(g_fq).apply(
-                    cumulative_return_around_event, g_fq
-                )
-                all_returns.append(avgcumret)
-            q_returns = pd.concat(all_returns, axis=1)
-            q_returns = pd.DataFrame({'mean': q_returns.mean(axis=1),
-                                      'std': q_returns.std(axis=1)})
-            return q_returns.unstack(level=1).stack(level=0)
-        elif demeaned:
-            fq = factor_data['factor_quantile']
-            return fq.groupby(fq).apply(average_cumulative_return, fq)
-        else:
-            fq = factor_data['factor_quantile']
-            return fq.groupby(fq).apply(average_cumulative_return, None)
+        segment_keys = [quantiles, date_pos]
+
+    label_codes, labels = _factorize_keys(label_keys)
+    labels = list(zip(*labels))
+    segment_codes = _group_codes(segment_keys)
+    num_segments = segment_codes.max() + 1 if len(segment_codes) else 0
+    segment_labels = np.zeros(num_segments, dtype=np.int64)
+    segment_labels[segment_codes] = label_codes
+
+    if group_adjust:
+        demean_codes = _group_codes([groups, date_pos])
+    elif demeaned:
+        demean_codes = date_pos
+    else:
+        demean_codes = None
+
+    mean = np.full((len(labels), len(offsets)), np.nan)
+    std = np.full((len(labels), len(offsets)), np.nan)
+    for i, offset in enumerate(offsets):
+        window = _event_windows(returns.values, date_pos, asset_pos,
+                                np.array([offset]))[:, 0]
+
+        if demean_codes is not None:
+            num_demean = demean_codes.max() + 1
+            window = window - _segment_nanmean(window, demean_codes,
+                                               num_demean)[demean_codes]
+
+        segment_window = _segment_nanmean(window, segment_codes,
+                                          num_segments)
+        segment_window[np.isinf(segment_window)] = np.nan
+
+        mean[:, i] = _segment_nanmean(segment_window, segment_labels,
+                                      len(labels))
+        std[:, i] = _segment_nanstd(segment_window, segment_labels,
+                                    len(labels))
+
+    valid_offsets = _valid_event_offsets(date_pos, offsets,
+                                         len(returns.index))
+
+    avg_cumulative_returns = np.empty((2 * len(labels), len(offsets)))
+    avg_cumulative_returns[0::2] = mean
+    avg_cumulative_returns[1::2] = std
+
+    if by_group:
+        index = pd.MultiIndex.from_tuples(
+            [(quantile, stat, group)
+             for group, quantile in labels for stat in ('mean', 'std')],
+            names=['factor_quantile', None, 'group'])
+    else:
+        index = pd.MultiIndex.from_tuples(
+            [(quantile, stat)
+             for (quantile,) in labels for stat in ('mean', 'std')],
+            names=['factor_quantile', None])
+
+    return pd.DataFrame(avg_cumulative_returns[:, valid_offsets],
+                        index=index,
+                        columns=offsets[valid_offsets])
 
 
 def factor_cumulative_returns(factor_data,
@@ -1164,3 +1574,94 @@ def create_pyfolio_input(factor_data,
         benchmark_rets = None
 
     return returns, positions, benchmark_rets
+
+
+def factor_summary(factor_data, demeaned=True, group_adjust=False):
+    """
+    Summary statistics used to compare and rank factors: mean IC, IC
+    information ratio, top minus bottom quantile mean return and top
+    quantile turnover, for each forward returns period.
+
+    Parameters
+    ----------
+    factor_data : pd.DataFrame - MultiIndex
+        A MultiIndex DataFrame indexed by date (level 0) and asset (level 1),
+        containing the values for a single alpha factor, forward returns for
+        each period, the factor quantile/bin that factor value belongs to, and
+        (optionally) the group the asset belongs to.
+        - See full explanation in utils.get_clean_factor_and_forward_returns
+    demeaned : bool
+        Compute demeaned mean returns (long short portfolio)
+    group_adjust : bool
+        Demean forward returns by group before computing IC and mean returns
+
+    Returns
+    -------
+    summary : pd.DataFrame
+        Forward returns periods on the index and 'IC Mean', 'ICIR',
+        'Top-Bottom Spread' (mean return spread, as a rate of return of the
+        first period) and 'Turnover' (mean top quantile turnover, only for
+        periods multiple of a day) on the columns
+    """
+    ic = factor_information_coefficient(factor_data, group_adjust)
+    ic_mean = ic.mean()
+
+    mean_ret, _ = mean_return_by_quantile(factor_data, demeaned=demeaned,
+                                          group_adjust=group_adjust)
+    mean_ret = mean_ret.apply(utils.rate_of_return, axis=0,
+                              base_period=mean_ret.columns[0])
+
+    top_quantile = factor_data['factor_quantile'].max()
+    bottom_quantile = factor_data['factor_quantile'].min()
+    spread = mean_ret.loc[top_quantile] - mean_ret.loc[bottom_quantile]
+
+    turnover = pd.Series(np.nan, index=ic.columns)
+    day_periods = utils.get_forward_returns_columns(
+        ic.columns, require_exact_day_multiple=True)
+    if len(day_periods) > 0:
+        periods = utils.timedelta_strings_to_integers(day_periods)
+        quant_turnover = quantile_turnover_by_period(
+            factor_data['factor_quantile'], periods, quantiles=[top_quantile])
+        for col, period in zip(day_periods, periods):
+            turnover[col] = quant_turnover[period][top_quantile].mean()
+
+    return pd.DataFrame({
+        'IC Mean': ic_mean,
+        'ICIR': ic_mean / ic.std(),
+        'Top-Bottom Spread': spread,
+        'Turnover': turnover,
+    })
+
+
+def concat_date_chunks(func, chunks, *args, **kwargs):
+    """
+    Applies a date by date analysis to factor data split in date chunks and
+    concatenates the results, so that the whole factor data never needs to be
+    in memory at once.
+
+    It gives the same results as calling 'func' on the whole factor data as
+    long as 'func' output for a date depends only on that date data, e.g.
+    factor_information_coefficient, factor_weights, factor_returns or
+    mean_return_by_quantile with by_date=True.
+
+    Parameters
+    ----------
+    func : callable
+        Analysis function taking the factor data as first argument
+    chunks : iterable of pd.DataFrame - MultiIndex
+        Factor data chunks not sharing any date, as yielded by
+        utils.iter_clean_factor_and_forward_returns or
+        utils.read_clean_factor
+    *args, **kwargs
+        Forwarded to 'func'
+
+    Returns
+    -------
+    pd.DataFrame or pd.Series or tuple
+        The concatenated 'func' results, element-wise if 'func' returns a
+        tuple
+    """
+    results = [func(chunk, *args, **kwargs) for chunk in chunks]
+    if len(results) > 0 and isinstance(results[0], tuple):
+        return tuple(pd.concat(parts) for parts in zip(*results))
+    return pd.concat(results)
@@ -150,23 +150,14 @@ def create_summary_tear_sheet(
     # Turnover Analysis
     quantile_factor = factor_data["factor_quantile"]
 
-    quantile_turnover = {
-        p: pd.concat(
-            [
-                perf.quantile_turnover(quantile_factor, q, p)
-                for q in range(1, int(quantile_factor.max()) + 1)
-            ],
-            axis=1,
-        )
-        for p in periods
-    }
+    quantile_turnover = perf.quantile_turnover_by_period(
+        quantile_factor,
+        periods,
+        quantiles=list(range(1, int(quantile_factor.max()) + 1)),
+    )
 
-    autocorrelation = pd.concat(
-        [
-            perf.factor_rank_autocorrelation(factor_data, period)
-            for period in periods
-        ],
-        axis=1,
+    autocorrelation = perf.factor_rank_autocorrelation_by_period(
+        factor_data, periods
     )
 
     plotting.plot_turnover_table(autocorrelation, quantile_turnover)
@@ -440,23 +431,12 @@ def create_turnover_tear_sheet(factor_data, turnover_periods=None):
 
     quantile_factor = factor_data["factor_quantile"]
 
-    quantile_turnover = {
-        p: pd.concat(
-            [
-                perf.quantile_turnover(quantile_factor, q, p)
-                for q in quantile_factor.sort_values().unique().tolist()
-            ],
-            axis=1,
-        )
-        for p in turnover_periods
-    }
-
-    autocorrelation = pd.concat(
-        [
-            perf.factor_rank_autocorrelation(factor_data, period)
-            for period in turnover_periods
-        ],
-        axis=1,
+    quantile_turnover = perf.quantile_turnover_by_period(
+        quantile_factor, turnover_periods
+    )
+
+    autocorrelation = perf.factor_rank_autocorrelation_by_period(
+        factor_data, turnover_periods
     )
 
     plotting.plot_turnover_table(autocorrelation, quantile_turnover)
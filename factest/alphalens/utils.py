@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
 import pandas as pd
 import numpy as np
 import re
@@ -22,6 +23,8 @@ from IPython.display import display
 from pandas.tseries.offsets import CustomBusinessDay, Day, BusinessDay
 from scipy.stats import mode
 
+logger = logging.getLogger(__name__)
+
 
 class NonMatchingTimezoneError(Exception):
     pass
@@ -170,9 +173,163 @@ def quantize_factor(factor_data,
     return factor_quantile.dropna()
 
 
-def infer_trading_calendar(factor_idx, prices_idx):
+_WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+class TradingCalendar(object):
     """
-    Infer the trading calendar from factor and price information.
+    Array backed trading calendar.
+
+    The calendar is described by the traded weekdays and the holidays, as
+    CustomBusinessDay is, but the date arithmetic is done on whole arrays
+    of dates through a numpy busdaycalendar built only once, so that shifting
+    an index by N trading days or counting the trading days between two
+    indexes costs a single vectorized call instead of one offset application
+    per timestamp.
+
+    Parameters
+    ----------
+    weekmask : str
+        Traded weekdays, e.g. 'Mon Tue Wed Thu Fri'
+    holidays : sequence of datetime64[D]
+        Non traded days falling on traded weekdays
+    sessions : array of datetime64[D], optional
+        The trading days the calendar has been inferred from
+    """
+
+    def __init__(self, weekmask, holidays=(), sessions=None):
+        self.weekmask = weekmask
+        self.holidays = np.unique(np.asarray(holidays, dtype='datetime64[D]'))
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask,
+                                           holidays=self.holidays)
+        if sessions is not None:
+            sessions = np.unique(np.asarray(sessions, dtype='datetime64[D]'))
+        self.sessions = sessions
+        self._offset = None
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        """
+        Build the calendar from the actual trading days: the traded weekdays
+        are the weekdays found in 'sessions' and the holidays are the traded
+        weekdays, within the sessions range, missing from 'sessions'
+        """
+        sessions = np.unique(np.asarray(sessions, dtype='datetime64[D]'))
+        if len(sessions) == 0:
+            raise ValueError("Cannot infer a trading calendar without dates")
+
+        all_days = np.arange(sessions[0], sessions[-1] + 1)
+        # 1970-01-01 was a Thursday
+        traded = np.zeros(7, dtype=bool)
+        traded[(sessions.view('i8') + 3) % 7] = True
+        candidates = all_days[traded[(all_days.view('i8') + 3) % 7]]
+        holidays = candidates[~np.isin(candidates, sessions,
+                                       assume_unique=True)]
+
+        weekmask = ' '.join(name for name, t in zip(_WEEKDAY_NAMES, traded)
+                            if t)
+        return cls(weekmask, holidays, sessions)
+
+    @classmethod
+    def from_offset(cls, freq):
+        """
+        Build the calendar of a Day, BusinessDay or CustomBusinessDay
+        offset, a TradingCalendar is returned unchanged. The calendar steps
+        by one trading day, whatever the multiplier 'n' of the offset
+        """
+        if isinstance(freq, TradingCalendar):
+            return freq
+        if isinstance(freq, CustomBusinessDay):
+            cal = cls.__new__(cls)
+            cal.weekmask = freq.weekmask
+            cal.holidays = np.asarray(freq.holidays, dtype='datetime64[D]')
+            cal.busdaycal = freq.calendar
+            cal.sessions = None
+            cal._offset = freq.base
+            return cal
+        if isinstance(freq, BusinessDay):
+            return cls('Mon Tue Wed Thu Fri')
+        if isinstance(freq, Day):
+            return cls(' '.join(_WEEKDAY_NAMES))
+        raise ValueError("freq must be Day, BusinessDay, CustomBusinessDay "
+                         "or TradingCalendar")
+
+    @property
+    def offset(self):
+        """
+        CustomBusinessDay equivalent to this calendar, used where pandas
+        needs a DateOffset (e.g. DatetimeIndex.freq or resample)
+        """
+        if self._offset is None:
+            self._offset = CustomBusinessDay(weekmask=self.weekmask,
+                                             holidays=list(self.holidays))
+        return self._offset
+
+    def session_index(self, dates):
+        """
+        Position of 'dates' in the trading days the calendar has been
+        inferred from (-1 for non trading days)
+        """
+        if self.sessions is None:
+            raise ValueError("calendar has not been built from sessions")
+        days = _to_days(dates)
+        idx = self.sessions.searchsorted(days)
+        found = idx < len(self.sessions)
+        found[found] = self.sessions[idx[found]] == days[found]
+        return np.where(found, idx, -1)
+
+    def add_sessions(self, dates, n):
+        """
+        Shift 'dates' by 'n' trading days. The time of the day is preserved
+        and, as for CustomBusinessDay, dates not on the calendar are rolled
+        forward when n <= 0 and backward otherwise
+        """
+        single = not isinstance(dates, pd.DatetimeIndex)
+        dates = pd.DatetimeIndex([dates]) if single else dates
+
+        tz = dates.tz
+        if tz is not None:
+            dates = dates.tz_localize(None)
+        days = _to_days(dates)
+        time = dates.values - days.astype(dates.values.dtype)
+
+        roll = 'forward' if n <= 0 else 'backward'
+        shifted = np.busday_offset(days, n, roll=roll,
+                                   busdaycal=self.busdaycal)
+        result = pd.DatetimeIndex(shifted.astype(dates.values.dtype) + time)
+        if tz is not None:
+            result = result.tz_localize(tz)
+        return result[0] if single else result
+
+    def count_sessions(self, start, end):
+        """
+        Number of trading days in [start, end), negative if end < start
+        """
+        return np.busday_count(_to_days(start), _to_days(end),
+                               busdaycal=self.busdaycal)
+
+
+def _to_days(dates):
+    """
+    Calendar days of 'dates' (wall clock days for timezone aware dates)
+    """
+    if isinstance(dates, (pd.Timestamp, pd.DatetimeIndex)) and \
+            dates.tz is not None:
+        dates = dates.tz_localize(None)
+    if isinstance(dates, pd.Timestamp):
+        dates = dates.to_datetime64()
+    return np.asarray(dates).astype('datetime64[D]')
+
+
+_trading_calendar_cache = {}
+
+
+def trading_calendar(factor_idx, prices_idx):
+    """
+    TradingCalendar of the trading days in factor and prices indexes. The
+    calendar is memoised on the trading days, so repeated calls with the
+    same data (e.g. one per get_clean_factor_and_forward_returns call) only
+    build it once.
 
     Parameters
     ----------
@@ -183,34 +340,37 @@ def infer_trading_calendar(factor_idx, prices_idx):
 
     Returns
     -------
-    calendar : pd.DateOffset
+    calendar : TradingCalendar
     """
     full_idx = factor_idx.union(prices_idx)
+    sessions = np.unique(_to_days(full_idx))
 
-    traded_weekdays = []
-    holidays = []
-
-    days_of_the_week = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    for day, day_str in enumerate(days_of_the_week):
+    key = sessions.tobytes()
+    calendar = _trading_calendar_cache.get(key)
+    if calendar is None:
+        if len(_trading_calendar_cache) >= 16:
+            _trading_calendar_cache.pop(next(iter(_trading_calendar_cache)))
+        calendar = TradingCalendar.from_sessions(sessions)
+        _trading_calendar_cache[key] = calendar
+    return calendar
 
-        weekday_mask = (full_idx.dayofweek == day)
 
-        # drop days of the week that are not traded at all
-        if not weekday_mask.any():
-            continue
-        traded_weekdays.append(day_str)
+def infer_trading_calendar(factor_idx, prices_idx):
+    """
+    Infer the trading calendar from factor and price information.
 
-        # look for holidays
-        used_weekdays = full_idx[weekday_mask].normalize()
-        all_weekdays = pd.date_range(full_idx.min(), full_idx.max(),
-                                     freq=CustomBusinessDay(weekmask=day_str)
-                                     ).normalize()
-        _holidays = all_weekdays.difference(used_weekdays)
-        _holidays = [timestamp.date() for timestamp in _holidays]
-        holidays.extend(_holidays)
+    Parameters
+    ----------
+    factor_idx : pd.DatetimeIndex
+        The factor datetimes for which we are computing the forward returns
+    prices_idx : pd.DatetimeIndex
+        The prices datetimes associated withthe factor data
 
-    traded_weekdays = ' '.join(traded_weekdays)
-    return CustomBusinessDay(weekmask=traded_weekdays, holidays=holidays)
+    Returns
+    -------
+    calendar : pd.DateOffset
+    """
+    return trading_calendar(factor_idx, prices_idx).offset
 
 
 def compute_forward_returns(factor,
@@ -266,7 +426,7 @@ def compute_forward_returns(factor,
                                        "the pandas methods tz_localize and "
                                        "tz_convert.")
 
-    freq = infer_trading_calendar(factor_dateindex, prices.index)
+    calendar = trading_calendar(factor_dateindex, prices.index)
 
     factor_dateindex = factor_dateindex.intersection(prices.index)
 
@@ -275,22 +435,63 @@ def compute_forward_returns(factor,
                          "they have the same convention in terms of datetimes "
                          "and symbol-names")
 
+    labels = _forward_returns_labels(factor_dateindex, prices.index, periods,
+                                     calendar)
+
+    return _compute_forward_returns(factor, prices, periods, filter_zscore,
+                                    cumulative_returns, calendar, labels)
+
+
+def _forward_returns_labels(factor_dateindex, prices_index, periods,
+                            calendar):
+    """
+    Forward returns column names of 'periods', in sorted periods order
+    """
+    #
+    # Find the period length, which will be the column name. We'll test
+    # several entries in order to find out the most likely period length
+    # (in case the user passed inconsinstent data)
+    #
+    p_idx = prices_index.get_indexer(factor_dateindex[:30])
+    p_idx = p_idx[p_idx >= 0]
+
+    labels = []
+    for period in sorted(periods):
+        valid = p_idx + period < len(prices_index)
+        if not valid.any():
+            raise ValueError("Not enough prices to compute %d periods "
+                             "forward returns" % period)
+        start = prices_index[p_idx[valid]]
+        end = prices_index[p_idx[valid] + period]
+        days_diffs = calendar.count_sessions(start, end)
+
+        timediff = end[-1] - start[-1]
+        period_len = timediff - pd.Timedelta(days=timediff.components.days) \
+            + pd.Timedelta(days=int(mode(days_diffs).mode[0]))
+        labels.append(timedelta_to_string(period_len))
+
+    return labels
+
+
+def _compute_forward_returns(factor, prices, periods, filter_zscore,
+                             cumulative_returns, calendar, labels):
+    """
+    compute_forward_returns with the trading calendar and the forward returns
+    column names ('labels', in sorted periods order) given, so that chunks of
+    a factor get the columns of the whole factor
+    """
+    factor_dateindex = factor.index.levels[0].intersection(prices.index)
+
     # chop prices down to only the assets we care about (= unique assets in
     # `factor`).  we could modify `prices` in place, but that might confuse
     # the caller.
     prices = prices.filter(items=factor.index.levels[1])
 
     raw_values_dict = {}
-    column_list = []
 
-    for period in sorted(periods):
-        if cumulative_returns:
-            returns = prices.pct_change(period)
-        else:
-            returns = prices.pct_change()
-
-        forward_returns = \
-            returns.shift(-period).reindex(factor_dateindex)
+    for period, label in zip(sorted(periods), labels):
+        forward_returns = _wide_forward_returns(prices, factor_dateindex,
+                                                period, cumulative_returns)
 
         if filter_zscore is not None:
             mask = abs(
@@ -298,30 +499,6 @@ def compute_forward_returns(factor,
             ) > (filter_zscore * forward_returns.std())
             forward_returns[mask] = np.nan
 
-        #
-        # Find the period length, which will be the column name. We'll test
-        # several entries in order to find out the most likely period length
-        # (in case the user passed inconsinstent data)
-        #
-        days_diffs = []
-        for i in range(30):
-            if i >= len(forward_returns.index):
-                break
-            p_idx = prices.index.get_loc(forward_returns.index[i])
-            if p_idx is None or p_idx < 0 or (
-                    p_idx + period) >= len(prices.index):
-                continue
-            start = prices.index[p_idx]
-            end = prices.index[p_idx + period]
-            period_len = diff_custom_calendar_timedeltas(start, end, freq)
-            days_diffs.append(period_len.components.days)
-
-        delta_days = period_len.components.days - mode(days_diffs).mode[0]
-        period_len -= pd.Timedelta(days=delta_days)
-        label = timedelta_to_string(period_len)
-
-        column_list.append(label)
-
         raw_values_dict[label] = np.concatenate(forward_returns.values)
 
     df = pd.DataFrame.from_dict(raw_values_dict)
@@ -335,14 +512,27 @@ def compute_forward_returns(factor,
     df = df.reindex(factor.index)
 
     # now set the columns correctly
-    df = df[column_list]
+    df = df[list(labels)]
 
-    df.index.levels[0].freq = freq
+    df.index.levels[0].freq = calendar.offset
     df.index.set_names(['date', 'asset'], inplace=True)
 
     return df
 
 
+def _wide_forward_returns(prices, dateindex, period, cumulative_returns):
+    """
+    'period' forward returns of 'prices' on 'dateindex', dates as index and
+    assets as columns
+    """
+    if cumulative_returns:
+        returns = prices.pct_change(period)
+    else:
+        returns = prices.pct_change()
+
+    return returns.shift(-period).reindex(dateindex)
+
+
 def backshift_returns_series(series, N):
     """Shift a multi-indexed series backwards by N observations in
     the first level.
@@ -410,12 +600,81 @@ def demean_forward_returns(factor_data, grouper=None):
         grouper = factor_data.index.get_level_values('date')
 
     cols = get_forward_returns_columns(factor_data.columns)
-    factor_data[cols] = factor_data.groupby(grouper)[cols] \
-        .transform(lambda x: x - x.mean())
+    factor_data[cols] = factor_data[cols] \
+        - factor_data.groupby(grouper)[cols].transform('mean')
 
     return factor_data
 
 
+def demeaned_forward_returns(factor_data, group_adjust=False):
+    """
+    Forward returns relative to the mean period wise all-universe (or group,
+    if 'group_adjust') returns, without copying the whole factor_data.
+
+    Parameters
+    ----------
+    factor_data : pd.DataFrame - MultiIndex
+        A MultiIndex DataFrame indexed by date (level 0) and asset (level 1),
+        containing the values for a single alpha factor, forward returns for
+        each period, the factor quantile/bin that factor value belongs to, and
+        (optionally) the group the asset belongs to.
+        - See full explanation in utils.get_clean_factor_and_forward_returns
+    group_adjust : bool
+        If True, demean according to date and group, otherwise according to
+        date only.
+
+    Returns
+    -------
+    adjusted_forward_returns : pd.DataFrame - MultiIndex
+        DataFrame with the forward returns columns of 'factor_data' only,
+        demeaned by date (and group).
+    """
+    cols = get_forward_returns_columns(factor_data.columns)
+
+    grouper = [factor_data.index.get_level_values('date')]
+    if group_adjust:
+        grouper.append('group')
+
+    demeaned = factor_data[cols] \
+        - factor_data.groupby(grouper)[cols].transform('mean')
+
+    return demeaned
+
+
+def compact_factor_data(factor_data):
+    """
+    Stores clean factor data with compact dtypes: forward returns and factor
+    as float32 and factor_quantile as the smallest integer type holding the
+    quantiles, which roughly halves the memory of the frame. Date and asset
+    are already integer coded by the MultiIndex (codes plus unique levels)
+    and 'group' is categorical, so the index is left as it is.
+
+    The alphalens performance functions accept compact factor data, their
+    reductions are computed in float64.
+
+    Parameters
+    ----------
+    factor_data : pd.DataFrame - MultiIndex
+        A MultiIndex DataFrame indexed by date (level 0) and asset (level 1),
+        containing the values for a single alpha factor, forward returns for
+        each period, the factor quantile/bin that factor value belongs to, and
+        (optionally) the group the asset belongs to.
+        - See full explanation in utils.get_clean_factor_and_forward_returns
+
+    Returns
+    -------
+    pd.DataFrame - MultiIndex
+        factor_data with compact dtypes
+    """
+    columns = get_forward_returns_columns(factor_data.columns) \
+        .append(pd.Index(['factor']))
+    dtypes = {col: np.float32 for col in columns}
+    compact = factor_data.astype(dtypes)
+    compact['factor_quantile'] = pd.to_numeric(
+        factor_data['factor_quantile'], downcast='integer')
+    return compact
+
+
 def print_table(table, name=None, fmt=None):
     """
     Pretty print a pandas DataFrame.
@@ -458,7 +717,8 @@ def get_clean_factor(factor,
                      bins=None,
                      groupby_labels=None,
                      max_loss=0.35,
-                     zero_aware=False):
+                     zero_aware=False,
+                     compact=False):
     """
     Formats the factor data, forward return data, and group mappings into a
     DataFrame that contains aligned MultiIndex indices of timestamp and asset.
@@ -555,6 +815,9 @@ def get_clean_factor(factor,
         signal values. This is useful if your signal is centered and zero is
         the separation between long and short signals, respectively.
         'quantiles' is None.
+    compact : bool, optional
+        If True, the returned data uses compact dtypes (float32 values and
+        small integer quantiles), see compact_factor_data.
 
     Returns
     -------
@@ -588,6 +851,32 @@ def get_clean_factor(factor,
                       --------------------------------------------------------
     """
 
+    merged_data, initial_amount, fwdret_amount, binning_amount = \
+        _clean_factor(factor, forward_returns, groupby, binning_by_group,
+                      quantiles, bins, groupby_labels, max_loss, zero_aware)
+
+    _check_max_loss(initial_amount, fwdret_amount, binning_amount, max_loss)
+
+    if compact:
+        merged_data = compact_factor_data(merged_data)
+
+    return merged_data
+
+
+def _clean_factor(factor,
+                  forward_returns,
+                  groupby,
+                  binning_by_group,
+                  quantiles,
+                  bins,
+                  groupby_labels,
+                  max_loss,
+                  zero_aware):
+    """
+    get_clean_factor without the data loss check, returns the clean factor
+    data and the number of factor entries before cleaning, after dropping
+    missing forward returns and after binning
+    """
     initial_amount = float(len(factor.index))
 
     factor_copy = factor.copy()
@@ -598,30 +887,7 @@ def get_clean_factor(factor,
     merged_data['factor'] = factor_copy
 
     if groupby is not None:
-        if isinstance(groupby, dict):
-            diff = set(factor_copy.index.get_level_values(
-                'asset')) - set(groupby.keys())
-            if len(diff) > 0:
-                raise KeyError(
-                    "Assets {} not in group mapping".format(
-                        list(diff)))
-
-            ss = pd.Series(groupby)
-            groupby = pd.Series(index=factor_copy.index,
-                                data=ss[factor_copy.index.get_level_values(
-                                    'asset')].values)
-
-        if groupby_labels is not None:
-            diff = set(groupby.values) - set(groupby_labels.keys())
-            if len(diff) > 0:
-                raise KeyError(
-                    "groups {} not in passed group names".format(
-                        list(diff)))
-
-            sn = pd.Series(groupby_labels)
-            groupby = pd.Series(index=groupby.index,
-                                data=sn[groupby.values].values)
-
+        groupby = _map_groups(groupby, groupby_labels, factor_copy.index)
         merged_data['group'] = groupby.astype('category')
 
     merged_data = merged_data.dropna()
@@ -644,23 +910,61 @@ def get_clean_factor(factor,
 
     binning_amount = float(len(merged_data.index))
 
+    return merged_data, initial_amount, fwdret_amount, binning_amount
+
+
+def _map_groups(groupby, groupby_labels, factor_index):
+    """
+    'groupby' as a Series of group names: a dict of asset groups is mapped
+    onto 'factor_index' and 'groupby_labels' (if any) are applied
+    """
+    if isinstance(groupby, dict):
+        diff = set(factor_index.get_level_values(
+            'asset')) - set(groupby.keys())
+        if len(diff) > 0:
+            raise KeyError(
+                "Assets {} not in group mapping".format(
+                    list(diff)))
+
+        ss = pd.Series(groupby)
+        groupby = pd.Series(index=factor_index,
+                            data=ss[factor_index.get_level_values(
+                                'asset')].values)
+
+    if groupby_labels is not None:
+        diff = set(groupby.values) - set(groupby_labels.keys())
+        if len(diff) > 0:
+            raise KeyError(
+                "groups {} not in passed group names".format(
+                    list(diff)))
+
+        sn = pd.Series(groupby_labels)
+        groupby = pd.Series(index=groupby.index,
+                            data=sn[groupby.values].values)
+
+    return groupby
+
+
+def _check_max_loss(initial_amount, fwdret_amount, binning_amount, max_loss):
+    """
+    Report the factor data dropped by get_clean_factor and raise
+    MaxLossExceededError if it exceeds 'max_loss'
+    """
     tot_loss = (initial_amount - binning_amount) / initial_amount
     fwdret_loss = (initial_amount - fwdret_amount) / initial_amount
     bin_loss = tot_loss - fwdret_loss
 
-    print("Dropped %.1f%% entries from factor data: %.1f%% in forward "
-          "returns computation and %.1f%% in binning phase "
-          "(set max_loss=0 to see potentially suppressed Exceptions)." %
-          (tot_loss * 100, fwdret_loss * 100, bin_loss * 100))
+    logger.info("Dropped %.1f%% entries from factor data: %.1f%% in forward "
+                "returns computation and %.1f%% in binning phase "
+                "(set max_loss=0 to see potentially suppressed Exceptions).",
+                tot_loss * 100, fwdret_loss * 100, bin_loss * 100)
 
     if tot_loss > max_loss:
         message = ("max_loss (%.1f%%) exceeded %.1f%%, consider increasing it."
                    % (max_loss * 100, tot_loss * 100))
         raise MaxLossExceededError(message)
     else:
-        print("max_loss is %.1f%%, not exceeded: OK!" % (max_loss * 100))
-
-    return merged_data
+        logger.info("max_loss is %.1f%%, not exceeded: OK!", max_loss * 100)
 
 
 def get_clean_factor_and_forward_returns(factor,
@@ -674,7 +978,8 @@ def get_clean_factor_and_forward_returns(factor,
                                          groupby_labels=None,
                                          max_loss=0.35,
                                          zero_aware=False,
-                                         cumulative_returns=True):
+                                         cumulative_returns=True,
+                                         compact=False):
     """
     Formats the factor data, pricing data, and group mappings into a DataFrame
     that contains aligned MultiIndex indices of timestamp and asset. The
@@ -788,6 +1093,9 @@ def get_clean_factor_and_forward_returns(factor,
         If True, forward returns columns will contain cumulative returns.
         Setting this to False is useful if you want to analyze how predictive
         a factor is for a single forward day.
+    compact : bool, optional
+        If True, the returned data uses compact dtypes (float32 values and
+        small integer quantiles), see compact_factor_data.
 
     Returns
     -------
@@ -836,8 +1144,365 @@ def get_clean_factor_and_forward_returns(factor,
                                    groupby_labels=groupby_labels,
                                    quantiles=quantiles, bins=bins,
                                    binning_by_group=binning_by_group,
-                                   max_loss=max_loss, zero_aware=zero_aware)
+                                   max_loss=max_loss, zero_aware=zero_aware,
+                                   compact=compact)
+
+    return factor_data
+
+
+def iter_clean_factor_and_forward_returns(factor,
+                                          prices,
+                                          groupby=None,
+                                          binning_by_group=False,
+                                          quantiles=5,
+                                          bins=None,
+                                          periods=(1, 5, 10),
+                                          filter_zscore=20,
+                                          groupby_labels=None,
+                                          max_loss=0.35,
+                                          zero_aware=False,
+                                          cumulative_returns=True,
+                                          compact=False,
+                                          chunksize=250):
+    """
+    Streaming version of get_clean_factor_and_forward_returns: the factor is
+    processed in chunks of 'chunksize' dates and the clean factor data is
+    yielded chunk by chunk, so that the whole merged frame never needs to be
+    in memory at once.
+
+    The chunks concatenated together are the same as the output of
+    get_clean_factor_and_forward_returns called with the same arguments:
+
+    - the prices window of each chunk is extended by max(periods) rows, so
+      the forward returns at the end of a chunk look ahead into the next one
+    - prices are forward filled across chunk boundaries as pct_change does
+    - the 'filter_zscore' mean and standard deviation of each asset forward
+      returns are computed over the full period in a first pass over the
+      chunks (only when filter_zscore is not None)
+    - forward returns column names and 'group' categories are computed on
+      the whole factor, so they are the same for all the chunks
+    - chunks left empty by the cleaning are not yielded
+
+    Quantiles and bins are computed date by date (or date and group by
+    group), so they do not depend on the chunking. The max_loss check is done
+    on the whole factor once the last chunk has been yielded.
+
+    Parameters
+    ----------
+    factor, prices, groupby, binning_by_group, quantiles, bins, periods,
+    filter_zscore, groupby_labels, max_loss, zero_aware, cumulative_returns,
+    compact
+        See get_clean_factor_and_forward_returns
+    chunksize : int, optional
+        Number of factor dates in each chunk
+
+    Yields
+    ------
+    factor_data : pd.DataFrame - MultiIndex
+        Clean factor data of consecutive date chunks, see
+        get_clean_factor_and_forward_returns for details.
+        'date' index freq property is set to the trading calendar inferred
+        from the whole input data
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
+
+    factor_dateindex = factor.index.levels[0]
+    if factor_dateindex.tz != prices.index.tz:
+        raise NonMatchingTimezoneError("The timezone of 'factor' is not the "
+                                       "same as the timezone of 'prices'. See "
+                                       "the pandas methods tz_localize and "
+                                       "tz_convert.")
+
+    calendar = trading_calendar(factor_dateindex, prices.index)
+
+    #
+    # rows of each date chunk: factor rows sorted by date, the rows of a
+    # chunk are then a contiguous range of 'order'
+    #
+    date_codes = factor.index.codes[0]
+    order = np.argsort(date_codes, kind='mergesort')
+    date_ends = np.cumsum(np.bincount(date_codes,
+                                      minlength=len(factor_dateindex)))
+    date_starts = np.concatenate([[0], date_ends[:-1]])
+
+    dates = factor_dateindex.argsort()
+    prices_pos = prices.index.get_indexer(factor_dateindex)
+    max_period = max(periods)
+
+    chunks = []
+    for first in range(0, len(dates), chunksize):
+        chunk_dates = dates[first:first + chunksize]
+        pos = prices_pos[chunk_dates]
+        pos = pos[pos >= 0]
+        if len(pos) == 0:
+            chunks.append((chunk_dates, None, None))
+            continue
+        lo = pos.min()
+        hi = min(pos.max() + max_period + 1, len(prices.index))
+        chunks.append((chunk_dates, lo, hi))
+
+    if all(lo is None for _, lo, _ in chunks):
+        raise ValueError("Factor and prices indices don't match: make sure "
+                         "they have the same convention in terms of datetimes "
+                         "and symbol-names")
+
+    prices = prices.filter(items=factor.index.levels[1])
+
+    def price_windows():
+        # 'window' holds the forward filled prices from 'window_lo' on, the
+        # rows shared with the previous chunk window are not filled again
+        window = prices.iloc[:0]
+        window_lo = 0
+        for chunk_dates, lo, hi in chunks:
+            if lo is None:
+                yield chunk_dates, None
+                continue
+            new_rows = prices.iloc[window_lo + len(window):hi]
+            window = pd.concat([window, new_rows]).ffill()
+            window = window.iloc[lo - window_lo:]
+            window_lo = lo
+            yield chunk_dates, window
+
+    def chunk_factor(chunk_dates):
+        rows = np.concatenate([order[date_starts[d]:date_ends[d]]
+                               for d in chunk_dates])
+        factor_chunk = factor.iloc[np.sort(rows)]
+        # the date level keeps every date of the chunk, with or without rows,
+        # as the whole factor index does: the calendar freq is set on it
+        index = factor_chunk.index.remove_unused_levels()
+        chunk_dateindex = factor_dateindex[np.sort(chunk_dates)]
+        date_codes = chunk_dateindex.get_indexer(index.levels[0])[
+            index.codes[0]]
+        factor_chunk.index = pd.MultiIndex(
+            levels=[chunk_dateindex, index.levels[1]],
+            codes=[date_codes, index.codes[1]], names=index.names)
+        return factor_chunk
+
+    #
+    # first pass: full period mean and std of each asset forward returns
+    #
+    zscore_stats = None
+    if filter_zscore is not None:
+        count = {p: 0. for p in periods}
+        mean = {p: 0. for p in periods}
+        m2 = {p: 0. for p in periods}
+        for chunk_dates, window in price_windows():
+            if window is None:
+                continue
+            dateindex = factor_dateindex[chunk_dates].intersection(
+                window.index)
+            for period in periods:
+                fwd = _wide_forward_returns(window, dateindex, period,
+                                            cumulative_returns)
+                c_count = fwd.count()
+                c_mean = fwd.mean()
+                c_m2 = ((fwd - c_mean) ** 2).sum()
+                # merge chunk moments (Chan et al.)
+                tot = count[period] + c_count
+                delta = (c_mean - mean[period]).fillna(0.)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    mean[period] = mean[period] + \
+                        (delta * c_count / tot).fillna(0.)
+                    m2[period] = m2[period] + c_m2 + (
+                        delta ** 2 * count[period] * c_count / tot
+                    ).fillna(0.)
+                count[period] = tot
+        zscore_stats = {}
+        for period in periods:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(m2[period] / (count[period] - 1))
+            std[count[period] < 2] = np.nan
+            avg = mean[period].where(count[period] > 0)
+            zscore_stats[period] = (avg, std)
+
+    #
+    # 'group' categories of the whole factor
+    #
+    categories = None
+    if groupby is not None:
+        finite_index = factor.index[np.isfinite(factor.values)]
+        finite_index = finite_index.rename(['date', 'asset'])
+        groupby = _map_groups(groupby, groupby_labels, finite_index)
+        categories = pd.Series(pd.unique(groupby.values)).astype(
+            'category').cat.categories
+
+    #
+    # forward returns column names of the whole factor, a chunk may not have
+    # any date with a full forward window
+    #
+    labels = _forward_returns_labels(
+        factor_dateindex.intersection(prices.index), prices.index, periods,
+        calendar)
+
+    initial_amount = fwdret_amount = binning_amount = 0.
+    for chunk_dates, window in price_windows():
+        factor_chunk = chunk_factor(chunk_dates)
+        # dates of the index levels may have no factor rows
+        if window is None or len(factor_chunk) == 0:
+            initial_amount += len(factor_chunk)
+            continue
 
+        forward_returns = _compute_forward_returns(factor_chunk, window,
+                                                   periods, None,
+                                                   cumulative_returns,
+                                                   calendar, labels)
+
+        if zscore_stats is not None:
+            assets = forward_returns.index.levels[1]
+            asset_codes = forward_returns.index.codes[1]
+            for period, label in zip(sorted(periods), labels):
+                avg, std = zscore_stats[period]
+                avg = avg.reindex(assets).values
+                std = std.reindex(assets).values
+                values = forward_returns[label].values
+                with np.errstate(invalid='ignore'):
+                    mask = abs(values - avg[asset_codes]) > \
+                        filter_zscore * std[asset_codes]
+                forward_returns.loc[mask, label] = np.nan
+
+        forward_returns.index.levels[0].freq = calendar.offset
+
+        chunk_groupby = None
+        if groupby is not None:
+            chunk_groupby = groupby.reindex(forward_returns.index)
+
+        factor_data, initial, fwdret, binning = _clean_factor(
+            factor_chunk, forward_returns, chunk_groupby, binning_by_group,
+            quantiles, bins, None, max_loss, zero_aware)
+        initial_amount += initial
+        fwdret_amount += fwdret
+        binning_amount += binning
+
+        # nothing left in the chunk, e.g. no forward returns at its end
+        if len(factor_data) == 0:
+            continue
+
+        if categories is not None:
+            factor_data['group'] = \
+                factor_data['group'].cat.set_categories(categories)
+
+        if compact:
+            factor_data = compact_factor_data(factor_data)
+
+        yield factor_data
+
+    _check_max_loss(initial_amount, fwdret_amount, binning_amount, max_loss)
+
+
+def write_clean_factor_and_forward_returns(path, factor, prices,
+                                           key='factor_data', **kwargs):
+    """
+    Computes the clean factor data in date chunks, see
+    iter_clean_factor_and_forward_returns, and appends them to a HDF5 table
+    so that it can be read back, or processed chunk by chunk, with
+    read_clean_factor.
+
+    Parameters
+    ----------
+    path : str
+        HDF5 file path, an existing 'key' table is replaced
+    factor, prices
+        See get_clean_factor_and_forward_returns
+    key : str, optional
+        HDF5 table name
+    **kwargs
+        Forwarded to iter_clean_factor_and_forward_returns
+
+    Returns
+    -------
+    int
+        Number of rows written
+    """
+    rows = 0
+    freq = None
+    with pd.HDFStore(path, mode='a') as store:
+        if key in store:
+            store.remove(key)
+        for factor_data in iter_clean_factor_and_forward_returns(
+                factor, prices, **kwargs):
+            freq = factor_data.index.levels[0].freq
+            if len(factor_data) == 0:
+                continue
+            store.append(key, factor_data, format='table')
+            rows += len(factor_data)
+        if rows > 0:
+            store.get_storer(key).attrs.freq = freq
+    return rows
+
+
+def read_clean_factor(path, key='factor_data', chunksize=None):
+    """
+    Reads clean factor data written by write_clean_factor_and_forward_returns
+
+    Parameters
+    ----------
+    path : str
+        HDF5 file path
+    key : str, optional
+        HDF5 table name
+    chunksize : int, optional
+        If not None an iterator is returned, yielding chunks of about
+        'chunksize' rows. Each chunk contains all the entries of the dates it
+        spans, so date by date analysis can be done chunk by chunk (see
+        performance.concat_date_chunks)
+
+    Returns
+    -------
+    pd.DataFrame or iterator of pd.DataFrame
+        Clean factor data, 'date' index freq property is set to the trading
+        calendar the data was computed with
+    """
+    if chunksize is None:
+        with pd.HDFStore(path, mode='r') as store:
+            freq = store.get_storer(key).attrs.freq
+            factor_data = store.select(key)
+        return _set_date_freq(factor_data, freq)
+
+    def iter_chunks():
+        with pd.HDFStore(path, mode='r') as store:
+            freq = store.get_storer(key).attrs.freq
+            pending = None
+            for chunk in store.select(key, chunksize=chunksize):
+                if pending is not None:
+                    chunk = pd.concat([pending, chunk])
+                # the last date may continue in the next chunk
+                dates = chunk.index.get_level_values('date')
+                last = dates == dates[-1]
+                if last.all():
+                    pending = chunk
+                    continue
+                pending = chunk[last]
+                chunk = chunk[~last]
+                yield _set_date_freq(chunk, freq)
+            if pending is not None:
+                yield _set_date_freq(pending, freq)
+
+    return iter_chunks()
+
+
+def _set_date_freq(factor_data, freq):
+    """
+    Sets the 'date' index level freq property to 'freq'. The dates without
+    entries are not stored in the HDF5 table, so a date level with gaps is
+    extended to all the 'freq' dates between its first and last date
+    """
+    index = factor_data.index
+    dates = index.levels[0]
+    if freq is None or len(dates) == 0:
+        return factor_data
+    try:
+        dates.freq = freq
+        return factor_data
+    except ValueError:
+        all_dates = pd.date_range(dates[0], dates[-1], freq=freq)
+        if not dates.isin(all_dates).all():
+            raise
+    codes = all_dates.get_indexer(dates)[index.codes[0]]
+    factor_data.index = pd.MultiIndex(levels=[all_dates, index.levels[1]],
+                                      codes=[codes, index.codes[1]],
+                                      names=index.names)
+    factor_data.index.levels[0].freq = freq
     return factor_data
 
 
@@ -977,18 +1642,26 @@ def add_custom_calendar_timedelta(input, timedelta, freq):
     ----------
     input : pd.DatetimeIndex or pd.Timestamp
     timedelta : pd.Timedelta
-    freq : pd.DataOffset (CustomBusinessDay, Day or BusinessDay)
+    freq : TradingCalendar or pd.DataOffset (CustomBusinessDay, Day or
+        BusinessDay)
 
     Returns
     -------
     pd.DatetimeIndex or pd.Timestamp
         input + timedelta
     """
-    if not isinstance(freq, (Day, BusinessDay, CustomBusinessDay)):
-        raise ValueError("freq must be Day, BDay or CustomBusinessDay")
+    if not isinstance(freq, (Day, BusinessDay, CustomBusinessDay,
+                             TradingCalendar)):
+        raise ValueError("freq must be Day, BDay, CustomBusinessDay or "
+                         "TradingCalendar")
     days = timedelta.components.days
     offset = timedelta - pd.Timedelta(days=days)
-    return input + freq * days + offset
+    if isinstance(freq, Day):
+        return input + freq * days + offset
+    calendar = TradingCalendar.from_offset(freq)
+    # a business day offset steps by its multiplier n (e.g. BDay(3))
+    n = 1 if isinstance(freq, TradingCalendar) else freq.n
+    return calendar.add_sessions(input, days * n) + offset
 
 
 def diff_custom_calendar_timedeltas(start, end, freq):
@@ -1001,39 +1674,19 @@ def diff_custom_calendar_timedeltas(start, end, freq):
     ----------
     start : pd.Timestamp
     end : pd.Timestamp
-    freq : CustomBusinessDay (see infer_trading_calendar)
-    freq : pd.DataOffset (CustomBusinessDay, Day or BDay)
+    freq : TradingCalendar or pd.DataOffset (CustomBusinessDay, Day or BDay)
 
     Returns
     -------
     pd.Timedelta
         end - start
     """
-    if not isinstance(freq, (Day, BusinessDay, CustomBusinessDay)):
-        raise ValueError("freq must be Day, BusinessDay or CustomBusinessDay")
-
-    weekmask = getattr(freq, 'weekmask', None)
-    holidays = getattr(freq, 'holidays', None)
-
-    if weekmask is None and holidays is None:
-        if isinstance(freq, Day):
-            weekmask = 'Mon Tue Wed Thu Fri Sat Sun'
-            holidays = []
-        elif isinstance(freq, BusinessDay):
-            weekmask = 'Mon Tue Wed Thu Fri'
-            holidays = []
-
-    if weekmask is not None and holidays is not None:
-        # we prefer this method as it is faster
-        actual_days = np.busday_count(np.array(start).astype('datetime64[D]'),
-                                      np.array(end).astype('datetime64[D]'),
-                                      weekmask, holidays)
-    else:
-        # default, it is slow
-        actual_days = pd.date_range(start, end, freq=freq).shape[0] - 1
-        if not freq.onOffset(start):
-            actual_days -= 1
+    if not isinstance(freq, (Day, BusinessDay, CustomBusinessDay,
+                             TradingCalendar)):
+        raise ValueError("freq must be Day, BusinessDay, CustomBusinessDay "
+                         "or TradingCalendar")
 
+    actual_days = TradingCalendar.from_offset(freq).count_sessions(start, end)
     timediff = end - start
     delta_days = timediff.components.days - actual_days
     return timediff - pd.Timedelta(days=delta_days)
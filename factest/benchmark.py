@@ -0,0 +1,267 @@
+"""benchmarks of the factor operators and of the alphalens pipeline on
+synthetic market data
+
+    python -m factest.benchmark --assets 200 --dates 500 --output bench.json
+    python -m factest.benchmark --baseline bench.json
+"""
+from contextlib import redirect_stdout
+import argparse
+import datetime
+import io
+import json
+import platform
+import re
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .data_service.synthetic_data import SyntheticData
+from .factorcal.utils import calculate_factor
+from .alphalens import utils
+from .factor_test import FactorTest
+from .utils import load_data_key_words
+
+# operator name to the formula timing it
+OPERATOR_BENCHMARKS = {
+    'RANK': 'RANK(CLOSE)',
+    'MAX': 'MAX(OPEN, CLOSE)',
+    'MIN': 'MIN(OPEN, CLOSE)',
+    'STD': 'STD(CLOSE, 10)',
+    'CORR': 'CORR(CLOSE, VOLUME, 10)',
+    'DELTA': 'DELTA(CLOSE, 5)',
+    'LOG': 'LOG(CLOSE)',
+    'SUM': 'SUM(CLOSE, 10)',
+    'ABS': 'ABS(CLOSE - OPEN)',
+    'MEAN': 'MEAN(CLOSE, 10)',
+    'TSRANK': 'TSRANK(CLOSE, 10)',
+    'SIGN': 'SIGN(CLOSE - OPEN)',
+    'COVIANCE': 'COVIANCE(CLOSE, VOLUME, 10)',
+    'DELAY': 'DELAY(CLOSE, 5)',
+    'TSMIN': 'TSMIN(CLOSE, 10)',
+    'TSMAX': 'TSMAX(CLOSE, 10)',
+    'PROD': 'PROD(CLOSE, 10)',
+    'PRREGBETAOD': 'PRREGBETAOD(CLOSE, OPEN, 10)',
+    'TREGRESI': 'TREGRESI(CLOSE, OPEN)',
+    'SMA': 'SMA(CLOSE, 10)',
+    'WMA': 'WMA(CLOSE, 10)',
+    'SUMAC': 'SUMAC(CLOSE, 10)',
+    'TRD': 'TRD(CLOSE > OPEN, CLOSE, OPEN)',
+    'COUNT': 'COUNT(CLOSE > OPEN, 10)',
+    'ZSCORE': 'ZSCORE(CLOSE)',
+    'WINSORIZE': 'WINSORIZE(CLOSE, 0.05)',
+    'NEUTRALIZE': 'NEUTRALIZE(CLOSE, OPEN, VOLUME)',
+    'ORTHO': 'ORTHO(CLOSE, OPEN, VOLUME)',
+    'NEUTRALIZE_INDUSTRY': 'NEUTRALIZE(CLOSE, INDUSTRY, LOG(CAP))',
+    'MADCLIP': 'MADCLIP(CLOSE, 3)',
+    'SCALE': 'SCALE(CLOSE)',
+    'FILLNA': 'FILLNA(CLOSE)',
+}
+
+# reference formulas timed end to end with calculate_factor
+REFERENCE_FORMULAS = {
+    'momentum': 'DELTA(CLOSE, 20) / DELAY(CLOSE, 20)',
+    'reversal': '-1 * RANK(DELTA(CLOSE, 5))',
+    'volatility': 'STD(CLOSE / DELAY(CLOSE, 1) - 1, 20)',
+    'volume_price_corr': '-1 * CORR(RANK(VOLUME), RANK(CLOSE), 10)',
+    'intraday': 'MEAN((CLOSE - OPEN) / (HIGH - LOW + 0.001), 10)',
+}
+
+FACTOR_TEST_ANALYSES = ['return_analysis', 'information_analysis',
+                        'turnover_analysis', 'event_analysis']
+
+
+def _time(func, repeat: int) -> dict:
+    """run func repeat times
+
+    Returns
+    -------
+    dict
+        'min', 'median' and 'mean' duration in seconds and 'repeat', or
+        'error' when func raised
+    """
+    durations = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+    except Exception as e:
+        return {'error': '{}: {}'.format(type(e).__name__, e)}
+    return _timings(durations)
+
+
+def _timings(durations: list) -> dict:
+    return {'min': min(durations), 'median': float(np.median(durations)),
+            'mean': float(np.mean(durations)), 'repeat': len(durations)}
+
+
+def run_benchmarks(n_assets: int = 200, n_dates: int = 500, missing_rate: float = 0.05,
+                   repeat: int = 3, pattern: str = None, periods=(1, 5, 10),
+                   quantiles: int = 5, seed: int = 0) -> dict:
+    """time the operators, calculate_factor on the reference formulas,
+    get_clean_factor_and_forward_returns and each FactorTest analysis on a
+    synthetic panel
+
+    Parameters
+    ----------
+    n_assets : int
+        number of assets
+    n_dates : int
+        number of trading days
+    missing_rate : float
+        share of (date, asset) cells without data
+    repeat : int
+        number of runs of each benchmark
+    pattern : str, optional
+        regular expression, only the benchmarks whose name matches are run
+    periods : sequence[int]
+        forward returns periods
+    quantiles : int
+        number of quantiles
+    seed : int
+        random seed of the synthetic panel
+
+    Returns
+    -------
+    dict
+        'meta' (panel and environment description) and 'results' (benchmark
+        name to timings in seconds, or to the error raised). Names are
+        'operator.<OP>', 'calculate_factor.<formula>',
+        'get_clean_factor_and_forward_returns' and 'FactorTest.<method>'
+    """
+    begin_date = '2015-01-05'
+    end_date = pd.bdate_range(begin_date, periods=n_dates)[-1].strftime('%Y-%m-%d')
+    data = SyntheticData(n_assets, begin_date, end_date, missing_rate=missing_rate, seed=seed)
+    data_key_words = load_data_key_words()
+
+    def selected(name):
+        return pattern is None or re.search(pattern, name) is not None
+
+    results = {}
+    with warnings.catch_warnings(), redirect_stdout(io.StringIO()):
+        warnings.simplefilter('ignore')
+
+        for name, formula in OPERATOR_BENCHMARKS.items():
+            name = 'operator.' + name
+            if selected(name):
+                # data fields are loaded before timing
+                calculate_factor(data, 'CLOSE + OPEN + VOLUME', data_key_words)
+                results[name] = _time(
+                    lambda: calculate_factor(data, formula, data_key_words), repeat)
+
+        for name, formula in REFERENCE_FORMULAS.items():
+            name = 'calculate_factor.' + name
+            if selected(name):
+                results[name] = _time(
+                    lambda: calculate_factor(data, formula, data_key_words), repeat)
+
+        factor = calculate_factor(data, REFERENCE_FORMULAS['momentum'], data_key_words)
+        prices = data.QUOTE
+        name = 'get_clean_factor_and_forward_returns'
+        if selected(name):
+            results[name] = _time(lambda: utils.get_clean_factor_and_forward_returns(
+                factor, prices, periods=periods, quantiles=quantiles, max_loss=1.0), repeat)
+
+        steps = ['factor_data'] + FACTOR_TEST_ANALYSES
+        durations = {step: [] for step in steps}
+        if any(selected('FactorTest.' + step) for step in steps):
+            for _ in range(repeat):
+                factor_test = FactorTest(data)
+                factor_test.set_period(periods)
+                factor_test.set_quantile(quantiles)
+                factor_test.set_long_short(True)
+                factor_test.set_formula(REFERENCE_FORMULAS['momentum'])
+                for step in steps:
+                    start = time.perf_counter()
+                    getattr(factor_test, step)()
+                    durations[step].append(time.perf_counter() - start)
+            for step in steps:
+                if selected('FactorTest.' + step):
+                    results['FactorTest.' + step] = _timings(durations[step])
+
+    meta = {
+        'n_assets': n_assets,
+        'n_dates': n_dates,
+        'missing_rate': missing_rate,
+        'periods': list(periods),
+        'quantiles': quantiles,
+        'seed': seed,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare_benchmarks(current: dict, baseline: dict, tolerance: float = 0.2,
+                       stat: str = 'min') -> pd.DataFrame:
+    """compare benchmark results with a baseline
+
+    Parameters
+    ----------
+    current : dict
+        run_benchmarks output
+    baseline : dict
+        run_benchmarks output of the reference run
+    tolerance : float
+        relative slow down above which a benchmark is a regression
+    stat : str
+        compared timing: 'min', 'median' or 'mean'
+
+    Returns
+    -------
+    pd.DataFrame
+        'baseline' and 'current' seconds, 'ratio' (current / baseline) and
+        'regression' flag, indexed by the benchmarks which succeeded in both
+        runs
+    """
+    names = [name for name, timings in current['results'].items()
+             if stat in timings and stat in baseline['results'].get(name, {})]
+    comparison = pd.DataFrame({
+        'baseline': [baseline['results'][name][stat] for name in names],
+        'current': [current['results'][name][stat] for name in names],
+    }, index=pd.Index(names, name='benchmark'))
+    comparison['ratio'] = comparison['current'] / comparison['baseline']
+    comparison['regression'] = comparison['ratio'] > 1 + tolerance
+    return comparison
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m factest.benchmark', description='factest benchmarks')
+    parser.add_argument('--assets', type=int, default=200, help='number of assets')
+    parser.add_argument('--dates', type=int, default=500, help='number of trading days')
+    parser.add_argument('--missing-rate', type=float, default=0.05,
+                        help='share of missing (date, asset) cells')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each benchmark')
+    parser.add_argument('--filter', default=None, help='regular expression on benchmark names')
+    parser.add_argument('--output', default=None, help='write the results to this json file')
+    parser.add_argument('--baseline', default=None, help='json results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative slow down reported as a regression')
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.assets, args.dates, args.missing_rate, args.repeat, args.filter)
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+    else:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparison = compare_benchmarks(current, baseline, args.tolerance)
+    print(comparison.to_string(), file=sys.stderr)
+    return 1 if comparison['regression'].any() else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""factest command line: run the factor tests of a job file
+
+    factest job.json --output out --processes 4
+    factest job.json --output out --resume
+
+job file (json):
+
+    {
+        "data_source": {"type": "local", "data_dir": "data/daily_price.h5"},
+        "universe": "all",
+        "begin_date": "2017-01-01",
+        "end_date": "2019-01-01",
+        "deal_method": "close",
+        "benchmark": null,
+        "periods": [1, 5, 10],
+        "quantiles": 5,
+        "long_short": false,
+        "group_neutral": false,
+        "weight_method": "equal",
+        "analyses": ["return", "information", "turnover"],
+        "report": "html",
+        "formulas": {"alpha_001": "-1*CORR(RANK(VOLUME), RANK(CLOSE), 6)"}
+    }
+
+Each formula gets a directory in the output directory with its exported
+results (see FactorTest.export_results) and its report; summary.csv gathers
+the summary statistics of every finished formula. Directory names are the
+formula names with the characters other than letters, digits, '.', '-' and
+'_' replaced by '_', they must be different for every formula.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import traceback
+
+import pandas as pd
+
+from .factor_test import FactorTest
+from .results import MANIFEST_FILE, load_results
+from .utils import get_benchmark_code
+
+logger = logging.getLogger(__name__)
+
+JOB_DEFAULTS = {
+    'universe': 'all',
+    'begin_date': '2015-01-01',
+    'end_date': '2018-01-01',
+    'deal_method': 'close',
+    'benchmark': None,
+    'periods': [1, 5, 10],
+    'quantiles': 5,
+    'long_short': False,
+    'group_neutral': False,
+    'weight_method': 'equal',
+    'analyses': ['return', 'information', 'turnover'],
+    'report': None,
+}
+
+ANALYSES = ['return', 'information', 'turnover', 'event']
+
+# data source of the worker process, created once from the job
+_worker_job = None
+_worker_data = None
+
+
+def load_job(path: str) -> dict:
+    """read a job file and fill in the defaults
+
+    Parameters
+    ----------
+    path : str
+        json job file
+
+    Returns
+    -------
+    dict
+        job, 'formulas' is a dict of factor name to formula
+    """
+    with open(path, encoding='utf-8') as f:
+        job = json.load(f)
+    if 'data_source' not in job or 'formulas' not in job:
+        raise ValueError('job file requires "data_source" and "formulas"')
+    job = dict(JOB_DEFAULTS, **job)
+
+    formulas = job['formulas']
+    if not isinstance(formulas, dict):
+        width = len(str(len(formulas)))
+        formulas = {'factor_{:0{}d}'.format(i, width): formula
+                    for i, formula in enumerate(formulas)}
+    job['formulas'] = formulas
+
+    # output directories are compared case insensitively, as on Windows and
+    # macOS file systems
+    directories = {}
+    for name in formulas:
+        directory = _directory_name(name).lower()
+        if directory in directories:
+            raise ValueError('formulas "{}" and "{}" have the same output directory "{}", '
+                             'rename one of them'.format(directories[directory], name,
+                                                        _directory_name(name)))
+        directories[directory] = name
+
+    unknown = set(job['analyses']) - set(ANALYSES)
+    if unknown:
+        raise ValueError('unknown analyses: {}'.format(sorted(unknown)))
+    return job
+
+
+def create_data_source(job: dict):
+    """data source of a job: 'type' is 'local', 'jq' or 'synthetic', the other
+    keys of job['data_source'] are passed to the data source constructor
+    """
+    config = dict(job['data_source'])
+    source_type = config.pop('type')
+    kwargs = {
+        'begin_date': job['begin_date'],
+        'end_date': job['end_date'],
+        'deal_method': job['deal_method'],
+        'universe': job['universe'],
+        'benchmark': None if job['benchmark'] is None else get_benchmark_code(job['benchmark']),
+    }
+    kwargs.update(config)
+    if source_type == 'local':
+        from .data_service.local_data import LocalData
+        return LocalData(**kwargs)
+    if source_type == 'jq':
+        from .data_service.jq_data import JQData
+        return JQData(**kwargs)
+    if source_type == 'synthetic':
+        from .data_service.synthetic_data import SyntheticData
+        return SyntheticData(**kwargs)
+    raise ValueError('unknown data source type: {}'.format(source_type))
+
+
+def _directory_name(name: str) -> str:
+    return re.sub(r'[^\w.-]', '_', name)
+
+
+def _init_worker(job: dict):
+    global _worker_job, _worker_data
+    _worker_job = job
+    _worker_data = None
+
+
+def _run_worker_formula(name: str, path: str):
+    global _worker_data
+    if _worker_data is None:
+        try:
+            _worker_data = create_data_source(_worker_job)
+        except Exception:
+            return name, traceback.format_exc()
+    return run_formula(_worker_data, _worker_job, name, path)
+
+
+def run_formula(data, job: dict, name: str, path: str):
+    """test one formula of the job and write its results to path. Results
+    are written to a temporary directory first: path only exists once the
+    formula is finished
+
+    Returns
+    -------
+    tuple
+        name and error message, None on success
+    """
+    formula = job['formulas'][name]
+    tmp_path = path + '.tmp'
+    try:
+        factor_test = FactorTest(data)
+        factor_test.set_period(tuple(job['periods']))
+        factor_test.set_quantile(job['quantiles'])
+        factor_test.set_long_short(job['long_short'])
+        factor_test.set_group_neutral(job['group_neutral'])
+        factor_test.set_weight_method(job['weight_method'])
+        factor_test.set_formula(formula)
+        for analysis in ANALYSES:
+            if analysis in job['analyses']:
+                getattr(factor_test, analysis + '_analysis')()
+
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        factor_test.export_results(tmp_path)
+        if job['report'] == 'html':
+            factor_test.render_report(os.path.join(tmp_path, 'report.html'), fmt='html')
+        elif job['report'] is not None:
+            factor_test.render_report(os.path.join(tmp_path, 'report'), fmt=job['report'])
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return name, traceback.format_exc()
+    return name, None
+
+
+def _finished(path: str) -> bool:
+    return os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+
+def summarize(job: dict, output_dir: str) -> pd.DataFrame:
+    """summary statistics of the finished formulas of a job
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per formula, columns '<statistic> <period>'
+    """
+    rows = {}
+    for name, formula in job['formulas'].items():
+        path = os.path.join(output_dir, _directory_name(name))
+        if not _finished(path):
+            continue
+        row = {'formula': formula}
+        summary = load_results(path).scalars['summary']
+        for statistic, values in summary.items():
+            for period, value in values.items():
+                row['{} {}'.format(statistic, period)] = value
+        rows[name] = row
+    return pd.DataFrame.from_dict(rows, orient='index').rename_axis('name')
+
+
+def run_job(job: dict, output_dir: str, processes: int = None, resume: bool = False) -> dict:
+    """run every formula of a job
+
+    Parameters
+    ----------
+    job : dict
+        job, see load_job
+    output_dir : str
+        output directory
+    processes : int, optional
+        number of worker processes, by default one per CPU
+    resume : bool
+        skip the formulas whose results are already in output_dir
+
+    Returns
+    -------
+    dict
+        name to error message of the failed formulas
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'job.json'), 'w', encoding='utf-8') as f:
+        json.dump(job, f, indent=2, ensure_ascii=False)
+
+    todo = []
+    for name in job['formulas']:
+        path = os.path.join(output_dir, _directory_name(name))
+        if resume and _finished(path):
+            continue
+        todo.append((name, path))
+    logger.info('%d formulas to run, %d already finished',
+                len(todo), len(job['formulas']) - len(todo))
+
+    errors = {}
+    if processes == 1 or len(todo) <= 1:
+        try:
+            data = create_data_source(job)
+        except Exception:
+            error = traceback.format_exc()
+            outcomes = ((name, error) for name, _ in todo)
+        else:
+            outcomes = (run_formula(data, job, name, path) for name, path in todo)
+        for done, (name, error) in enumerate(outcomes, 1):
+            if error is not None:
+                errors[name] = error
+            logger.info('[%d/%d] %s %s', done, len(todo), name, 'failed' if error else 'done')
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(job,)) as executor:
+            futures = [executor.submit(_run_worker_formula, name, path) for name, path in todo]
+            for done, ((name, _), future) in enumerate(zip(todo, futures), 1):
+                try:
+                    _, error = future.result()
+                except Exception:
+                    error = traceback.format_exc()
+                if error is not None:
+                    errors[name] = error
+                logger.info('[%d/%d] %s %s', done, len(todo), name, 'failed' if error else 'done')
+
+    for name, error in errors.items():
+        logger.error('%s failed:\n%s', name, error)
+    with open(os.path.join(output_dir, 'errors.json'), 'w', encoding='utf-8') as f:
+        json.dump(errors, f, indent=2)
+    summarize(job, output_dir).to_csv(os.path.join(output_dir, 'summary.csv'))
+    return errors
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='factest', description='run the factor tests of a job file')
+    parser.add_argument('job', help='json job file')
+    parser.add_argument('-o', '--output', default='factest_output', help='output directory')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='number of worker processes, one per CPU by default')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip the formulas already finished in the output directory')
+    parser.add_argument('-v', '--verbose', action='store_true', help='debug logging')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    logging.getLogger('matplotlib').setLevel(logging.WARNING)
+    job = load_job(args.job)
+    errors = run_job(job, args.output, processes=args.processes, resume=args.resume)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
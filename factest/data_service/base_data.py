@@ -482,6 +482,19 @@ class BaseDataSource(object):
         """
         pass
 
+    @property
+    @abstractmethod
+    def INDUSTRY(self) -> pd.DataFrame:
+        """industry (group) label of each asset, None if the data source
+        has no industry data
+
+        Returns
+        -------
+        pd.DataFrame
+            industry label
+        """
+        pass
+
 
 class Data:
     """data container
@@ -526,3 +539,5 @@ class Data:
 
         self.high_limit = None
         self.low_limit = None
+
+        self.industry = None
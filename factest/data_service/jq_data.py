@@ -1,5 +1,5 @@
 from .base_data import BaseDataSource, Data
-from jqdatasdk.api import get_fundamentals, get_index_stocks, get_price, get_trade_days
+from jqdatasdk.api import get_fundamentals, get_index_stocks, get_industry, get_price, get_trade_days
 from jqdatasdk.utils import query
 from jqdatasdk.finance_service import valuation
 
@@ -121,6 +121,44 @@ def get_jq_fundamentals(data: pd.DataFrame, name, universe, begin_date, end_date
     return data
 
 
+def get_jq_industry(data: pd.DataFrame, universe, begin_date, end_date, level='sw_l1') -> pd.DataFrame:
+    """ if data is empty, get industry data from jqdata.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        original data
+    universe :
+        stocks
+    begin_date :
+        begin date
+    end_date :
+        end date
+    level : str, optional
+        industry classification. eg: 'sw_l1', 'zjw', by default 'sw_l1'
+
+    Returns
+    -------
+    pd.DataFrame
+        industry name with multi-index
+    """
+    if data is None:
+        frames = []
+        trade_days = get_trade_days(end_date=end_date, start_date=begin_date)
+        for trade_day in trade_days:
+            industries = get_industry(list(universe), date=trade_day)
+            frames.append(pd.DataFrame({
+                'time': pd.Timestamp(trade_day),
+                'code': list(industries),
+                'industry': [industry.get(level, {}).get('industry_name')
+                             for industry in industries.values()],
+            }))
+        data = pd.concat(frames, ignore_index=True)
+        # format data
+        data = format_factor(data)
+    return data
+
+
 def get_jq_index_price(data: pd.DataFrame, index_name: str, name: str, begin_date, end_date, fq='pre') -> pd.DataFrame:
     """if data is empty, get index price data from jqdata.
 
@@ -457,3 +495,9 @@ class JQData(BaseDataSource):
     @property
     def LOWLIMIT(self) -> pd.DataFrame:
         pass
+
+    @property
+    def INDUSTRY(self) -> pd.DataFrame:
+        self.__data.industry = get_jq_industry(
+            self.__data.industry, self.universe, self.begin_date, self.end_date)
+        return self.__data.industry
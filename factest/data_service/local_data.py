@@ -69,6 +69,15 @@ def load_local_data(data_file_dir, start_date, end_date, universe):
     data.low_limit = format_factor(local_data[['low_limit']])
     data.pre_close = format_factor(local_data[['pre_close']])
     data.vwap = format_factor(local_data[['avg']])
+    if 'industry' in local_data.columns:
+        industry = local_data['industry']
+        if pd.api.types.is_numeric_dtype(industry):
+            # industry codes (e.g. SW codes) are group labels, not numbers
+            labels = industry.dropna()
+            if (labels % 1 == 0).all():
+                labels = labels.astype('int64')
+            industry = labels.astype(str).reindex(industry.index)
+        data.industry = format_factor(industry.to_frame())
 
     return data
 
@@ -124,6 +133,9 @@ class LocalData(BaseDataSource):
             deal method: support 'close', 'open', 'vwap'
         """
         self._deal_method = deal_method
+        # quote depends on the deal method
+        if self._data is not None:
+            self._data.quote = None
 
     def set_date_range(self, begin_date, end_date):
         """set date range (begin_date, end_date)
@@ -297,3 +309,11 @@ class LocalData(BaseDataSource):
     @property
     def LOWLIMIT(self) -> pd.DataFrame:
         pass
+
+    @property
+    def INDUSTRY(self) -> pd.DataFrame:
+        """'industry' column of the hdf file as str labels, None without it
+        """
+        if self._data is None:
+            self.__reload_all_data()
+        return self._data.industry
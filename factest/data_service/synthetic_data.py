@@ -0,0 +1,332 @@
+from .base_data import BaseDataSource, Data
+import numpy as np
+import pandas as pd
+
+
+def format_wide(data: pd.DataFrame) -> pd.DataFrame:
+    """format a wide panel (date x asset) as factor data with multi-index
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        wide panel
+
+    Returns
+    -------
+    pd.DataFrame
+        factor
+    """
+    data = data.stack(dropna=False).to_frame('factor')
+    data.index.names = ['date', 'asset']
+    return data
+
+
+def make_synthetic_panel(n_assets=500, begin_date='2015-01-01', end_date='2018-01-01',
+                         missing_rate=0.0, seed=0, n_industries=28) -> dict:
+    """generate random daily OHLCV panels
+
+    Parameters
+    ----------
+    n_assets : int
+        number of assets
+    begin_date :
+        begin date
+    end_date :
+        end date
+    missing_rate : float
+        share of (date, asset) cells without data, like a suspended stock
+    seed : int
+        random seed
+    n_industries : int
+        number of industries the assets are randomly assigned to
+
+    Returns
+    -------
+    dict
+        field name to wide panel (date x asset): 'open', 'high', 'low',
+        'close', 'pre_close', 'vwap', 'volume', 'amount', 'cap', 'turnover',
+        'high_limit', 'low_limit' and 'industry' (constant labels)
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(begin_date, end_date, name='date')
+    assets = pd.Index(['{:06d}.XSHE'.format(i + 1) for i in range(n_assets)], name='asset')
+    shape = (len(dates), n_assets)
+
+    drift = rng.normal(0.0002, 0.0005, n_assets)
+    volatility = rng.uniform(0.01, 0.04, n_assets)
+    log_ret = rng.normal(drift, volatility, shape)
+    close = rng.uniform(5, 50, n_assets) * np.exp(np.cumsum(log_ret, axis=0))
+    pre_close = np.vstack([close[:1] / np.exp(log_ret[:1]), close[:-1]])
+    open_ = pre_close * np.exp(rng.normal(0, volatility / 3, shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, volatility / 2, shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, volatility / 2, shape)))
+    vwap = (open_ + high + low + close) / 4
+    shares = rng.lognormal(20, 1, n_assets)
+    volume = np.round(shares * rng.lognormal(np.log(0.01), 0.5, shape), -2)
+
+    fields = {
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'pre_close': pre_close,
+        'vwap': vwap,
+        'volume': volume,
+        'amount': volume * vwap,
+        'cap': shares * close,
+        'turnover': volume / shares,
+        'high_limit': pre_close * 1.1,
+        'low_limit': pre_close * 0.9,
+    }
+    missing = rng.random(shape) < missing_rate
+    for name, values in fields.items():
+        values[missing] = np.nan
+        fields[name] = pd.DataFrame(values, index=dates, columns=assets)
+
+    industry = np.array(['industry_{:02d}'.format(i) for i in range(n_industries)], dtype=object)
+    industry = industry[rng.integers(0, n_industries, n_assets)]
+    fields['industry'] = pd.DataFrame(np.tile(industry, (len(dates), 1)), index=dates, columns=assets)
+    return fields
+
+
+class SyntheticData(BaseDataSource):
+    """random market data, for benchmarks and examples
+    """
+
+    def __init__(self, n_assets=500, begin_date='2015-01-01', end_date='2018-01-01', deal_method='close',
+                 universe='all', benchmark=None, missing_rate=0.0, seed=0, n_industries=28):
+
+        BaseDataSource.__init__(
+            self, begin_date, end_date, deal_method, benchmark)
+
+        self._panel = make_synthetic_panel(n_assets, begin_date, end_date, missing_rate, seed,
+                                           n_industries)
+        self._universe = universe
+        self._data = None
+
+    def __reload_all_data(self):
+        """select the universe and date range
+        """
+        assets = self._panel['close'].columns
+        if not isinstance(self._universe, str):
+            assets = assets[assets.isin(list(self._universe))]
+        panel = {name: values.loc[self._begin_date:self._end_date, assets]
+                 for name, values in self._panel.items()}
+
+        data = Data()
+        data.open = format_wide(panel['open'])
+        data.high = format_wide(panel['high'])
+        data.low = format_wide(panel['low'])
+        data.close = format_wide(panel['close'])
+        data.pre_close = format_wide(panel['pre_close'])
+        data.vwap = format_wide(panel['vwap'])
+        data.volume = format_wide(panel['volume'])
+        data.amount = format_wide(panel['amount'])
+        data.mcap = format_wide(panel['cap'])
+        data.cap = data.mcap
+        data.turnover = format_wide(panel['turnover'])
+        data.high_limit = format_wide(panel['high_limit'])
+        data.low_limit = format_wide(panel['low_limit'])
+        data.ret = data.close / data.pre_close - 1
+        data.industry = format_wide(panel['industry'])
+        self._data = data
+
+    def set_universe(self, universe):
+        """set stock universe(stock pool)
+
+        Parameters
+        ----------
+        universe :
+            'all' or asset codes
+        """
+        self._universe = universe
+        self._data = None
+
+    def set_benchmark(self, benchmark: str):
+        """set benchmark
+
+        Parameters
+        ----------
+        benchmark : str
+            benchmark name
+        """
+        self._benchmark = benchmark
+
+    def set_deal_method(self, deal_method):
+        """set deal method
+
+        Parameters
+        ----------
+        deal_method :
+            deal method: support 'close', 'open', 'vwap'
+        """
+        self._deal_method = deal_method
+        # quote depends on the deal method
+        if self._data is not None:
+            self._data.quote = None
+
+    def set_date_range(self, begin_date, end_date):
+        """set date range (begin_date, end_date), within the generated dates
+
+        Parameters
+        ----------
+        begin_date :
+            begin date
+        end_date :
+            end date
+        """
+        self._begin_date = begin_date
+        self._end_date = end_date
+        self._data = None
+
+    def __get(self, field: str) -> pd.DataFrame:
+        if self._data is None:
+            self.__reload_all_data()
+        return getattr(self._data, field)
+
+    @property
+    def QUOTE(self) -> pd.DataFrame:
+        if self._data is None:
+            self.__reload_all_data()
+
+        if self._data.quote is None:
+            data = None
+            if self._deal_method == 'open':
+                data = self._data.open
+            elif self._deal_method == 'close':
+                data = self._data.close
+            elif self._deal_method == 'vwap':
+                data = self._data.vwap
+            data = data['factor'].unstack()
+            data.columns.name = None
+            # next day
+            self._data.quote = data.shift(-1)
+        return self._data.quote
+
+    @property
+    def OPEN(self) -> pd.DataFrame:
+        return self.__get('open')
+
+    @property
+    def HIGH(self) -> pd.DataFrame:
+        return self.__get('high')
+
+    @property
+    def LOW(self) -> pd.DataFrame:
+        return self.__get('low')
+
+    @property
+    def CLOSE(self) -> pd.DataFrame:
+        return self.__get('close')
+
+    @property
+    def PRECLOSE(self) -> pd.DataFrame:
+        return self.__get('pre_close')
+
+    @property
+    def VWAP(self) -> pd.DataFrame:
+        return self.__get('vwap')
+
+    @property
+    def VOLUME(self) -> pd.DataFrame:
+        return self.__get('volume')
+
+    @property
+    def AMOUNT(self) -> pd.DataFrame:
+        return self.__get('amount')
+
+    @property
+    def MCAP(self) -> pd.DataFrame:
+        return self.__get('mcap')
+
+    @property
+    def ADJCLOSE(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def ADJOPEN(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def ADJLOW(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def ADJVWAP(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def ADJHIGH(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def ADJPRECLOSE(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def AFCLOSE(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def AFOPEN(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def AFHIGH(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def AFLOW(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def AFPRECLOSE(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def DEALAMOUNT(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def DEALVALUE(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def TURNOVER(self) -> pd.DataFrame:
+        return self.__get('turnover')
+
+    @property
+    def BENCHMARKINDEXOPEN(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def BENCHMARKINDEXCLOSE(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def BENCHMARKINDEXHIGH(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def BENCHMARKINDEXLOW(self) -> pd.DataFrame:
+        pass
+
+    @property
+    def RET(self) -> pd.DataFrame:
+        return self.__get('ret')
+
+    @property
+    def CAP(self) -> pd.DataFrame:
+        return self.__get('cap')
+
+    @property
+    def HIGHLIMIT(self) -> pd.DataFrame:
+        return self.__get('high_limit')
+
+    @property
+    def LOWLIMIT(self) -> pd.DataFrame:
+        return self.__get('low_limit')
+
+    @property
+    def INDUSTRY(self) -> pd.DataFrame:
+        return self.__get('industry')
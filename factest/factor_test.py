@@ -1,21 +1,126 @@
 
 from .data_service.base_data import BaseDataSource
 
-from .factorcal.utils import calculate_factor
-from .alphalens.utils import get_clean_factor_and_forward_returns, MaxLossExceededError
+from .factorcal.utils import calculate_factor, calculate_factors, profile_formula
+from .factorcal.profiler import FormulaProfile
+from .alphalens.utils import MaxLossExceededError
 
 from .utils import load_data_key_words, get_benchmark_code
+from .sweep import run_sweep
+from .screening import screen_factors, wide_forward_returns
+from .library import FactorLibrary
+from . import report
+from .results import write_results
+from .trace import Trace, span, rows
 import pandas as pd
 
 import matplotlib.pyplot as plt
 
+import logging
 import re
+from functools import wraps
 from .alphalens import plotting
 from .alphalens import performance as perf
 from .alphalens import utils
 from .alphalens.tears import GridFigure
 
 
+# configuration fields and cached artefacts each cached artefact depends on
+ARTEFACT_DEPENDENCIES = {
+    'factor': {'data_source', 'universe', 'date_range', 'benchmark', 'formula'},
+    'prices': {'data_source', 'universe', 'date_range', 'deal_method'},
+    'forward_returns': {'factor', 'prices', 'period'},
+    'factor_data': {'factor', 'forward_returns', 'quantile', 'compact', 'group_neutral', 'by_group'},
+    'returns': {'factor_data', 'weight_method', 'long_short', 'group_neutral', 'by_group'},
+    'information': {'factor_data', 'group_neutral', 'by_group'},
+    'turnover': {'factor_data'},
+    'events': {'factor_data', 'prices', 'returns', 'long_short', 'group_neutral', 'by_group'},
+}
+
+
+logger = logging.getLogger(__name__)
+
+# charts FactorTest.plot_<chart> draws, and the analysis artefact each one needs
+REPORT_CHARTS = {
+    'returns_table': 'returns',
+    'quantile_returns_bar': 'returns',
+    'quantile_returns_violin': 'returns',
+    'cumulative_returns': 'returns',
+    'mean_quantile_returns_spread_time_series': 'returns',
+    'cumulative_returns_by_quantile': 'returns',
+    'information_table': 'information',
+    'ic_ts': 'information',
+    'ic_hist': 'information',
+    'ic_qq': 'information',
+    'ic_by_group': 'information',
+    'monthly_ic_heatmap': 'information',
+    'turnover_table': 'turnover',
+    'factor_rank_auto_correlation': 'turnover',
+    'top_bottom_quantile_turnover': 'turnover',
+    'quantile_statistics_table': 'factor_data',
+    'quantile_average_cumulative_return': 'events',
+    'events_distribution': 'events',
+}
+
+
+def dependent_artefacts(field: str) -> set:
+    """cached artefacts depending, directly or not, on a configuration field or
+    on another artefact
+
+    Parameters
+    ----------
+    field : str
+        configuration field or artefact name
+
+    Returns
+    -------
+    set
+        names of the artefacts to invalidate when field changes
+    """
+    dependents = set()
+    changed = [field]
+    while changed:
+        name = changed.pop()
+        for artefact, dependencies in ARTEFACT_DEPENDENCIES.items():
+            if name in dependencies and artefact not in dependents:
+                dependents.add(artefact)
+                changed.append(artefact)
+    return dependents
+
+
+def _get_clean_factor(factors, forward_returns, quantile: int, name: str = None, tries: int = 9,
+                      **kwargs):
+    """utils.get_clean_factor, decreasing the quantile number while the data
+    loss exceeds max_loss
+
+    Returns
+    -------
+    tuple
+        clean factor data (None if every try exceeds max_loss) and the
+        quantile number it was computed with
+    """
+    prefix = '' if name is None else name + ' '
+    for try_num in range(1, tries + 1):
+        try:
+            return utils.get_clean_factor(factors, forward_returns, quantiles=quantile,
+                                          **kwargs), quantile
+        except MaxLossExceededError:
+            quantile -= 1
+            logger.warning('%stry %d--decreasing quantile number to: %d',
+                           prefix, try_num, quantile)
+    return None, quantile
+
+
+def _traced(method):
+    """record the method as a stage of the factor test trace
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with span(self.trace, method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class FactorTest():
 
     def __init__(self, dataSource: BaseDataSource):
@@ -28,8 +133,11 @@ class FactorTest():
         self.__long_short = None
         self.__group_neutral = None
         self.__by_group = None
+        self.__compact = False
 
         self.__data_key_words = None
+        self.__factors = None
+        self.__forward_returns = None
         self.__factor_data = None
 
         self.__factor_returns = None
@@ -56,43 +164,145 @@ class FactorTest():
         self.__avg_cumulative_returns = None
         self.__avg_cumret_by_group = None
 
+        self.__trace = None
+
     def __load_data_key_words(self):
         """load data key words. eg: 'OPEN', 'CLOSE'
         """
         self.__data_key_words = load_data_key_words()
 
-    def __clear_data(self):
-        """clear data
+    def __batch_formulas(self, formulas) -> dict:
+        """factor name to formula of a batch of formulas, a list of formulas
+        is named by the formulas themselves. Loads the data key words
         """
-        self.__factor_data = None
+        if not isinstance(formulas, dict):
+            formulas = {formula: formula for formula in formulas}
+        if self.__data_key_words is None:
+            self.__load_data_key_words()
+        return formulas
+
+    def __clear_data(self, field: str):
+        """clear the cached artefacts depending on a configuration field
+
+        Parameters
+        ----------
+        field : str
+            changed configuration field, see ARTEFACT_DEPENDENCIES
+        """
+        for artefact in dependent_artefacts(field):
+            self.__clear_artefact(artefact)
+
+    def __clear_artefact(self, artefact: str):
+        """clear a cached artefact
+
+        Parameters
+        ----------
+        artefact : str
+            artefact name, see ARTEFACT_DEPENDENCIES
+        """
+        if artefact == 'factor':
+            self.__factors = None
+        elif artefact == 'forward_returns':
+            self.__forward_returns = None
+        elif artefact == 'factor_data':
+            self.__factor_data = None
+        elif artefact == 'returns':
+            self.__factor_returns = None
+            self.__alpha_beta = None
+            self.__mean_quant_rateret = None
+            self.__mean_ret_spread_quant = None
+            self.__mean_quant_rateret_bydate = None
+            self.__std_spread_quant = None
+            self.__mean_quant_ret_bydate = None
+            self.__mean_return_quantile_group = None
+            self.__mean_return_quantile_group_std_err = None
+            self.__mean_quant_rateret_group = None
+            self.__num_groups = None
+        elif artefact == 'information':
+            self.__ic = None
+            self.__mean_monthly_ic = None
+            self.__mean_group_ic = None
+        elif artefact == 'turnover':
+            self.__quantile_turnover = None
+            self.__autocorrelation = None
+            self.__turnover_periods = None
+        elif artefact == 'events':
+            self.__avg_cumulative_returns = None
+            self.__avg_cumret_by_group = None
+
+    def forward_returns(self) -> pd.DataFrame:
+        """get forward returns
+        """
+        if self.__forward_returns is None:
+            factors = self.factors()
+            with span(self.__trace, 'prices') as s:
+                prices = self.prices()
+                s.rows = rows(prices)
+            with span(self.__trace, 'forward_returns') as s:
+                self.__forward_returns = utils.compute_forward_returns(
+                    factors, prices, periods=self.__period, filter_zscore=20)
+                s.rows = rows(self.__forward_returns)
+        return self.__forward_returns
 
     def factor_data(self) -> pd.DataFrame:
         """get merged data
         """
         if self.__factor_data is None:
             factors = self.factors()
-            prices = self.prices()
-            try_num = 1
-
-            while try_num < 10:
-                try:
-                    self.__factor_data = get_clean_factor_and_forward_returns(
-                        factors, prices, periods=self.__period, quantiles=self.__quantile)
-                    break
-                except MaxLossExceededError:
-                    self.set_quantile(self.__quantile - 1)
-                    print('try {try_num:}--decreasing quantile number to: {quantile:}'.format(
-                        try_num=try_num, quantile=self.__quantile))
-                try_num += 1
+            forward_returns = self.forward_returns()
+            groupby = self.groups() if self.__group_neutral or self.__by_group else None
+
+            with span(self.__trace, 'get_clean_factor') as s:
+                factor_data, quantile = _get_clean_factor(
+                    factors, forward_returns, self.__quantile, groupby=groupby,
+                    compact=self.__compact)
+                if quantile != self.__quantile:
+                    self.set_quantile(quantile)
+                self.__factor_data = factor_data
+                s.rows = rows(self.__factor_data)
 
         return self.__factor_data
 
+    def groups(self) -> pd.Series:
+        """industry of each (date, asset) from the data source, the 'group'
+        column of the factor data when group_neutral or by_group is set. None
+        if the data source has no industry data
+        """
+        industry = self.__data.INDUSTRY
+        if industry is None:
+            if self.__group_neutral or self.__by_group:
+                logger.warning('data source has no industry data, group analyses need a group column')
+            return None
+        return industry['factor']
+
     def factors(self) -> pd.DataFrame:
         """get factor data
         """
+        if self.__factors is None:
+            if self.__data_key_words is None:
+                self.__load_data_key_words()
+            with span(self.__trace, 'calculate_factor', formula=self.__formula) as s:
+                self.__factors = calculate_factor(
+                    self.__data, self.__formula, self.__data_key_words, trace=self.__trace)
+                s.rows = rows(self.__factors)
+        return self.__factors
+
+    def profile_formula(self, memory: bool = True) -> FormulaProfile:
+        """time each operator of the formula, see factorcal.utils.profile_formula
+
+        Parameters
+        ----------
+        memory : bool
+            trace memory allocations
+
+        Returns
+        -------
+        FormulaProfile
+            per node statistics and annotated formula
+        """
         if self.__data_key_words is None:
             self.__load_data_key_words()
-        return calculate_factor(self.__data, self.__formula, self.__data_key_words)
+        return profile_formula(self.__data, self.__formula, self.__data_key_words, memory=memory)
 
     def factor_returns(self):
         return self.__factor_returns
@@ -116,6 +326,14 @@ class FactorTest():
     def quantile(self) -> str:
         return self.__quantile
 
+    @property
+    def compact(self) -> bool:
+        return self.__compact
+
+    @property
+    def trace(self) -> Trace:
+        return self.__trace
+
     @property
     def data_source(self) -> BaseDataSource:
         return self.__data
@@ -136,9 +354,21 @@ class FactorTest():
         """
         return self.__data.QUOTE
 
+    def set_trace(self, trace: Trace = None):
+        """record the duration, CPU time, peak memory growth and output rows of
+        each stage (data loading, formula operators, forward returns, cleaning,
+        analyses) of the next computations
+
+        Parameters
+        ----------
+        trace : Trace, optional
+            trace receiving the spans, None turns tracing off
+        """
+        self.__trace = trace
+
     def set_by_group(self, by_group: bool):
         self.__by_group = by_group
-        self.__clear_data()
+        self.__clear_data('by_group')
 
     def set_group_neutral(self, group_neutral: bool):
         """set group neutral
@@ -149,12 +379,24 @@ class FactorTest():
             new group neutral
         """
         self.__group_neutral = group_neutral
-        self.__clear_data()
+        self.__clear_data('group_neutral')
+
+    def set_compact(self, compact: bool):
+        """set compact factor data dtypes
+
+        Parameters
+        ----------
+        compact : bool
+            if store factor data as float32 and quantiles as small integers
+        """
+        self.__compact = compact
+        self.__clear_data('compact')
 
     def set_data_source(self, data_source: BaseDataSource):
         """set data source
         """
         self.__data = data_source
+        self.__clear_data('data_source')
 
     def set_benchmark(self, benchmark: str):
         """set bench mark
@@ -165,7 +407,7 @@ class FactorTest():
             benchmark
         """
         self.__data.set_benchmark(get_benchmark_code(benchmark))
-        self.__clear_data()
+        self.__clear_data('benchmark')
 
     def set_date_range(self, begin_date: str, end_date: str):
         """set date range
@@ -178,7 +420,7 @@ class FactorTest():
             end date
         """
         self.__data.set_date_range(begin_date, end_date)
-        self.__clear_data()
+        self.__clear_data('date_range')
 
     def set_deal_method(self, deal_method: str):
         """set deal method
@@ -189,7 +431,7 @@ class FactorTest():
             deal method
         """
         self.__data.set_deal_method(deal_method)
-        self.__clear_data()
+        self.__clear_data('deal_method')
 
     def set_universe(self, universe):
         """set universe
@@ -203,7 +445,7 @@ class FactorTest():
             if universe != 'all':
                 universe = get_benchmark_code(universe)
         self.__data.set_universe(universe)
-        self.__clear_data()
+        self.__clear_data('universe')
 
     def set_period(self, period: tuple):
         """set period
@@ -214,7 +456,7 @@ class FactorTest():
             backtesting period
         """
         self.__period = period
-        self.__clear_data()
+        self.__clear_data('period')
 
     def set_formula(self, formula: str):
         """set factor formula
@@ -225,7 +467,7 @@ class FactorTest():
             factor formula
         """
         self.__formula = formula
-        self.__clear_data()
+        self.__clear_data('formula')
 
     def set_quantile(self, quantile: int):
         """set quantile
@@ -236,7 +478,7 @@ class FactorTest():
             quantile number
         """
         self.__quantile = quantile
-        self.__clear_data()
+        self.__clear_data('quantile')
 
     def set_weight_method(self, weight_method: str):
         """set weight method
@@ -247,7 +489,7 @@ class FactorTest():
             weight method
         """
         self.__weight_method = weight_method
-        self.__clear_data()
+        self.__clear_data('weight_method')
 
     def set_long_short(self, long_short: bool):
         """set long short
@@ -258,8 +500,9 @@ class FactorTest():
             if do both long position and short position or not
         """
         self.__long_short = long_short
-        self.__clear_data()
+        self.__clear_data('long_short')
 
+    @_traced
     def return_analysis(self):
         """calculate return performance
         """
@@ -273,24 +516,24 @@ class FactorTest():
         self.__factor_returns = perf.factor_returns(
             factor_data, long_short, group_neutral, equal_weight
         )
-        mean_quant_ret, std_quantile = perf.mean_return_by_quantile(
+        aggregations = [(False, False), (True, False)]
+        if self.__by_group:
+            aggregations.append((False, True))
+        mean_returns = perf.mean_return_by_quantile_multi(
             factor_data,
-            by_group=False,
+            aggregations=aggregations,
             demeaned=long_short,
             group_adjust=group_neutral,
         )
 
+        mean_quant_ret, std_quantile = mean_returns[(False, False)]
+
         self.__mean_quant_rateret = mean_quant_ret.apply(
             utils.rate_of_return, axis=0, base_period=mean_quant_ret.columns[0]
         )
 
-        self.__mean_quant_ret_bydate, std_quant_daily = perf.mean_return_by_quantile(
-            factor_data,
-            by_date=True,
-            by_group=False,
-            demeaned=long_short,
-            group_adjust=group_neutral,
-        )
+        self.__mean_quant_ret_bydate, std_quant_daily = \
+            mean_returns[(True, False)]
 
         self.__mean_quant_rateret_bydate = self.__mean_quant_ret_bydate.apply(
             utils.rate_of_return,
@@ -317,13 +560,7 @@ class FactorTest():
             (
                 self.__mean_return_quantile_group,
                 self.__mean_return_quantile_group_std_err,
-            ) = perf.mean_return_by_quantile(
-                factor_data,
-                by_date=False,
-                by_group=True,
-                demeaned=long_short,
-                group_adjust=group_neutral,
-            )
+            ) = mean_returns[(False, True)]
 
             self.__mean_quant_rateret_group = self.__mean_return_quantile_group.apply(
                 utils.rate_of_return,
@@ -336,6 +573,7 @@ class FactorTest():
                     "group").unique()
             )
 
+    @_traced
     def information_analysis(self):
         """calculate information performance
         """
@@ -356,39 +594,32 @@ class FactorTest():
                 self.factor_data(), group_adjust=self.__group_neutral, by_group=True
             )
 
+    @_traced
     def turnover_analysis(self):
         """calculate turnover performance
         """
+        factor_data = self.factor_data()
+
         if self.__turnover_periods is None:
             input_periods = utils.get_forward_returns_columns(
-                self.factor_data().columns, require_exact_day_multiple=True,).to_numpy()
+                factor_data.columns, require_exact_day_multiple=True,).to_numpy()
             self.__turnover_periods = utils.timedelta_strings_to_integers(
                 input_periods)
         else:
             self.__turnover_periods = utils.timedelta_strings_to_integers(
                 self.__turnover_periods,)
 
-        quantile_factor = self.factor_data()["factor_quantile"]
+        quantile_factor = factor_data["factor_quantile"]
 
-        self.__quantile_turnover = {
-            p: pd.concat(
-                [
-                    perf.quantile_turnover(quantile_factor, q, p)
-                    for q in quantile_factor.sort_values().unique().tolist()
-                ],
-                axis=1,
-            )
-            for p in self.__turnover_periods
-        }
+        self.__quantile_turnover = perf.quantile_turnover_by_period(
+            quantile_factor, self.__turnover_periods
+        )
 
-        self.__autocorrelation = pd.concat(
-            [
-                perf.factor_rank_autocorrelation(self.factor_data(), period)
-                for period in self.__turnover_periods
-            ],
-            axis=1,
+        self.__autocorrelation = perf.factor_rank_autocorrelation_by_period(
+            factor_data, self.__turnover_periods
         )
 
+    @_traced
     def event_analysis(self, avgretplot=(5, 15)):
         before, after = avgretplot
 
@@ -413,6 +644,246 @@ class FactorTest():
                 by_group=True,
             )
 
+    @_traced
+    def batch_analysis(self, formulas) -> pd.DataFrame:
+        """evaluate several factors at once. Data fields, sub-expressions
+        shared by the formulas and forward returns are computed only once.
+        A formula raising an error is logged and left out of the result
+
+        Parameters
+        ----------
+        formulas : list or dict
+            factor formulas, or factor name to formula
+
+        Returns
+        -------
+        pd.DataFrame
+            IC mean, ICIR, top-bottom spread and top quantile turnover,
+            indexed by factor name and period
+        """
+        formulas = self.__batch_formulas(formulas)
+
+        prices = self.prices()
+        groupby = self.groups() if self.__group_neutral else None
+        forward_returns = None
+        summaries = {}
+        for name, factors in calculate_factors(self.__data, formulas, self.__data_key_words,
+                                               trace=self.__trace, errors='yield'):
+            # a failing formula is logged and skipped, the batch goes on
+            try:
+                if isinstance(factors, Exception):
+                    raise factors
+                # factors computed on the same data share the forward returns
+                if forward_returns is None or not factors.index.equals(forward_returns.index):
+                    forward_returns = utils.compute_forward_returns(
+                        factors, prices, periods=self.__period, filter_zscore=20)
+
+                factor_data, _ = _get_clean_factor(
+                    factors, forward_returns, self.__quantile, name=name, groupby=groupby,
+                    compact=self.__compact)
+                if factor_data is None:
+                    continue
+
+                summaries[name] = perf.factor_summary(
+                    factor_data, demeaned=self.__long_short, group_adjust=self.__group_neutral)
+            except Exception as e:
+                logger.error('skip %s: %s: %s', name, type(e).__name__, e)
+
+        if len(summaries) == 0:
+            return pd.DataFrame()
+        return pd.concat(summaries, names=['factor', 'period'])
+
+    def screen(self, formulas) -> pd.DataFrame:
+        """fast screening of many formulas: rank IC statistics and turnover
+        proxies computed on wide panels, skipping the clean factor data
+
+        Parameters
+        ----------
+        formulas : list or dict
+            factor formulas, or factor name to formula
+
+        Returns
+        -------
+        pd.DataFrame
+            IC mean, IC std, ICIR, IC t-stat, IC positive rate, rank
+            autocorrelation and top quantile turnover, indexed by factor and
+            period
+        """
+        formulas = self.__batch_formulas(formulas)
+
+        forward_returns = wide_forward_returns(self.prices(), self.__period)
+        factors = ((name, factors['factor'].unstack())
+                   for name, factors in calculate_factors(self.__data, formulas, self.__data_key_words,
+                                                          trace=self.__trace))
+        with span(self.__trace, 'screen'):
+            return screen_factors(factors, forward_returns, quantiles=self.__quantile)
+
+    def factor_library(self, formulas, library: FactorLibrary = None) -> FactorLibrary:
+        """rank correlation of several formulas, see FactorLibrary
+
+        Parameters
+        ----------
+        formulas : list or dict
+            factor formulas, or factor name to formula
+        library : FactorLibrary, optional
+            library the factors are added to, a new one by default
+
+        Returns
+        -------
+        FactorLibrary
+            library holding the factors, corr() gives the correlation matrix
+            and prune() drops the redundant factors
+        """
+        formulas = self.__batch_formulas(formulas)
+        if library is None:
+            library = FactorLibrary()
+        for name, factors in calculate_factors(self.__data, formulas, self.__data_key_words,
+                                               trace=self.__trace):
+            library.add(name, factors['factor'].unstack())
+        return library
+
+    def sweep(self, grid: dict, processes: int = None) -> pd.DataFrame:
+        """evaluate the factor on every combination of the parameters in grid.
+        Factor values are shared across deal methods, periods and quantiles and
+        forward returns across periods and quantiles, cells run in parallel
+
+        Parameters
+        ----------
+        grid : dict
+            parameter ('universe', 'deal_method', 'period', 'quantile') to the
+            sequence of values to test, the other parameters keep their current
+            value. A 'period' value is a tuple of periods or a single period
+        processes : int, optional
+            number of worker processes, by default one per CPU
+
+        Returns
+        -------
+        pd.DataFrame
+            IC mean, ICIR, top-bottom spread and top quantile turnover, indexed
+            by universe, deal method, period, quantile and forward returns period
+        """
+        if self.__data_key_words is None:
+            self.__load_data_key_words()
+        defaults = {
+            'universe': None,
+            'deal_method': self.__data.deal_method,
+            'period': self.__period,
+            'quantile': self.__quantile,
+        }
+        return run_sweep(self.__data, self.__formula, self.__data_key_words, grid, defaults,
+                         long_short=self.__long_short, group_neutral=self.__group_neutral,
+                         compact=self.__compact, processes=processes)
+
+    def report_charts(self) -> list:
+        """charts which can be drawn with the analyses already run
+
+        Returns
+        -------
+        list
+            chart names, see REPORT_CHARTS
+        """
+        computed = {
+            'factor_data': self.__factor_data is not None,
+            'returns': self.__factor_returns is not None,
+            'information': self.__ic is not None,
+            'turnover': self.__quantile_turnover is not None,
+            'events': self.__avg_cumulative_returns is not None,
+        }
+        charts = [chart for chart, artefact in REPORT_CHARTS.items() if computed[artefact]]
+        if self.__mean_group_ic is None and 'ic_by_group' in charts:
+            charts.remove('ic_by_group')
+        if self.__mean_monthly_ic is None and 'monthly_ic_heatmap' in charts:
+            charts.remove('monthly_ic_heatmap')
+        return charts
+
+    def render_report(self, path: str, charts: list = None, fmt: str = 'html',
+                      processes: int = None) -> list:
+        """render charts off screen on Agg canvases to a single html file or to
+        one png / svg file per figure, figures are closed once saved. The
+        pyplot backend and the figures already open are left as they are
+
+        Parameters
+        ----------
+        path : str
+            html file path for 'html', output directory for 'png' and 'svg'
+        charts : list, optional
+            chart names (see REPORT_CHARTS), by default every chart the analyses
+            already run can draw
+        fmt : str
+            'html', 'png' or 'svg'
+        processes : int, optional
+            number of worker processes rendering the charts in parallel, by
+            default charts are rendered in the calling process
+
+        Returns
+        -------
+        list
+            written file paths
+        """
+        if charts is None:
+            charts = self.report_charts()
+        unknown = set(charts) - set(REPORT_CHARTS)
+        if unknown:
+            raise ValueError('unknown charts: {}'.format(sorted(unknown)))
+        return report.render_report(self, charts, path, fmt=fmt, processes=processes)
+
+    def export_results(self, path: str):
+        """write every computed artefact to a directory, tables to parquet files
+        and configuration and summary statistics to a json manifest. Load them
+        back with factest.results.load_results
+
+        Parameters
+        ----------
+        path : str
+            output directory
+        """
+        artefacts = {
+            'factor_data': self.__factor_data,
+            'factor_returns': self.__factor_returns,
+            'alpha_beta': self.__alpha_beta,
+            'mean_quant_rateret': self.__mean_quant_rateret,
+            'mean_ret_spread_quant': self.__mean_ret_spread_quant,
+            'mean_quant_rateret_bydate': self.__mean_quant_rateret_bydate,
+            'std_spread_quant': self.__std_spread_quant,
+            'mean_quant_ret_bydate': self.__mean_quant_ret_bydate,
+            'mean_return_quantile_group': self.__mean_return_quantile_group,
+            'mean_return_quantile_group_std_err': self.__mean_return_quantile_group_std_err,
+            'mean_quant_rateret_group': self.__mean_quant_rateret_group,
+            'ic': self.__ic,
+            'mean_monthly_ic': self.__mean_monthly_ic,
+            'mean_group_ic': self.__mean_group_ic,
+            'quantile_turnover': self.__quantile_turnover,
+            'autocorrelation': self.__autocorrelation,
+            'avg_cumulative_returns': self.__avg_cumulative_returns,
+            'avg_cumret_by_group': self.__avg_cumret_by_group,
+        }
+        tables = {name: table for name, table in artefacts.items() if table is not None}
+
+        summary = {}
+        if self.__ic is not None:
+            summary['IC Mean'] = self.__ic.mean()
+            summary['IC Std.'] = self.__ic.std()
+            summary['ICIR'] = self.__ic.mean() / self.__ic.std()
+        if self.__alpha_beta is not None:
+            for name, row in self.__alpha_beta.iterrows():
+                summary[name] = row
+        if self.__autocorrelation is not None:
+            summary['Mean Factor Rank Autocorrelation'] = self.__autocorrelation.mean()
+        scalars = {
+            'formula': self.__formula,
+            'period': self.__period,
+            'quantile': self.__quantile,
+            'weight_method': self.__weight_method,
+            'long_short': self.__long_short,
+            'group_neutral': self.__group_neutral,
+            'by_group': self.__by_group,
+            'compact': self.__compact,
+            'num_groups': self.__num_groups,
+            'turnover_periods': self.__turnover_periods,
+            'summary': {name: values.to_dict() for name, values in summary.items()},
+        }
+        write_results(path, tables, scalars)
+
     def plot_returns_table(self):
         plotting.plot_returns_table(
             self.__alpha_beta, self.__mean_quant_rateret, self.__mean_ret_spread_quant
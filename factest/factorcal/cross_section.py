@@ -0,0 +1,289 @@
+import numpy as np
+import pandas as pd
+
+
+def _values(panel) -> np.ndarray:
+    return np.asarray(panel, dtype=float)
+
+
+def _like(values: np.ndarray, panel):
+    if isinstance(panel, pd.DataFrame):
+        return pd.DataFrame(values, index=panel.index, columns=panel.columns)
+    return values
+
+
+def _row_mean_std(values: np.ndarray):
+    """mean and standard deviation (ddof=1) of each row, ignoring nan
+    """
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, values, 0.0).sum(axis=1, keepdims=True) / count
+        deviation = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((deviation * deviation).sum(axis=1, keepdims=True) / (count - 1))
+    return mean, std
+
+
+def zscore(panel):
+    """cross-sectional z-score of each date
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        (value - date mean) / date standard deviation, same shape as panel
+    """
+    values = _values(panel)
+    mean, std = _row_mean_std(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _like((values - mean) / std, panel)
+
+
+def winsorize(panel, lower: float = 0.025, upper: float = None):
+    """clip each date to its cross-sectional percentiles
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+    lower : float
+        values below the 'lower' quantile of their date are set to it
+    upper : float, optional
+        values above the '1 - upper' quantile of their date are set to it,
+        upper defaults to lower
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        clipped values, same shape as panel
+    """
+    if upper is None:
+        upper = lower
+    values = _values(panel)
+    low, high = np.full((2, values.shape[0], 1), np.nan)
+    rows = ~np.isnan(values).all(axis=1)
+    if rows.any():
+        low[rows], high[rows] = np.nanquantile(values[rows], [lower, 1 - upper], axis=1, keepdims=True)
+    return _like(np.clip(values, low, high), panel)
+
+
+def _row_median(values: np.ndarray) -> np.ndarray:
+    """median of each row ignoring nan, nan for empty rows
+    """
+    median = np.full((values.shape[0], 1), np.nan)
+    rows = ~np.isnan(values).all(axis=1)
+    if rows.any():
+        median[rows] = np.nanmedian(values[rows], axis=1, keepdims=True)
+    return median
+
+
+def mad_clip(panel, n: float = 3):
+    """clip each date to median +/- n * 1.4826 * median absolute deviation,
+    1.4826 * MAD estimating the standard deviation of normal values
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+    n : float
+        number of scaled deviations kept on each side of the median
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        clipped values, same shape as panel
+    """
+    values = _values(panel)
+    median = _row_median(values)
+    width = n * 1.4826 * _row_median(np.abs(values - median))
+    return _like(np.clip(values, median - width, median + width), panel)
+
+
+def scale(panel, a: float = 1):
+    """scale each date so that its absolute values sum to a
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+    a : float
+        gross sum of each date
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        scaled values, same shape as panel
+    """
+    values = _values(panel)
+    gross = np.nansum(np.abs(values), axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _like(values * (a / gross), panel)
+
+
+def fillna_median(panel):
+    """fill the missing values of each date with its median
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        filled values, same shape as panel. Empty dates stay missing
+    """
+    values = _values(panel)
+    median = _row_median(values)
+    return _like(np.where(np.isnan(values), median, values), panel)
+
+
+# cells of the (date, asset, exposure) design built at once by neutralize
+_BLOCK_CELLS = 2 ** 24
+
+
+def _group_means(values: np.ndarray, codes: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """mean of values over the valid cells of the same date and group code,
+    values being (date, asset) or (date, asset, exposure)
+    """
+    n_groups = codes.max() + 1
+    # one bin per (date, group), invalid cells go to an extra bin of their date
+    index = np.where(valid, codes, n_groups) + np.arange(len(codes))[:, None] * (n_groups + 1)
+    index = index.ravel()
+    count = np.bincount(index, minlength=len(codes) * (n_groups + 1))
+    columns = values.reshape(index.size, -1)
+    means = np.empty_like(columns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for k in range(columns.shape[1]):
+            sums = np.bincount(index, weights=columns[:, k], minlength=count.size)
+            means[:, k] = (sums / count)[index]
+    return means.reshape(values.shape)
+
+
+def _residuals(y: np.ndarray, x: np.ndarray, intercept: bool, codes: np.ndarray = None) -> np.ndarray:
+    """residuals of the regressions of the rows of y on x, a (date, asset,
+    exposure) array, and on the dummies of the group codes
+    """
+    valid = ~(np.isnan(y) | np.isnan(x).any(axis=-1))
+    if codes is not None:
+        valid &= codes >= 0
+    y0 = np.where(valid, y, 0.0)
+    x0 = np.where(valid[..., None], x, 0.0)
+    # rescaled columns (centered when there is a constant) leave the residuals
+    # unchanged and keep the normal equations well conditioned
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if codes is not None and valid.any():
+            # removing the group means of each date is the regression on the
+            # sparse one-hot design (Frisch-Waugh-Lovell), without building it
+            y0 = np.where(valid, y0 - _group_means(y0, codes, valid), 0.0)
+            x0 = np.where(valid[..., None], x0 - _group_means(x0, codes, valid), 0.0)
+        elif intercept:
+            count = valid.sum(axis=1)[:, None, None]
+            x0[..., 1:] -= x0[..., 1:].sum(axis=1, keepdims=True) / count
+            x0 = np.where(valid[..., None], x0, 0.0)
+        norm = np.sqrt((x0 * x0).sum(axis=1, keepdims=True))
+        x0 = np.where(norm > 0, x0 / norm, 0.0)
+    residuals = y0
+    if x0.shape[-1]:
+        # normal equations of every date, pinv copes with singular dates
+        xt = x0.transpose(0, 2, 1)
+        beta = np.matmul(np.linalg.pinv(np.matmul(xt, x0)), np.matmul(xt, y0[..., None]))
+        residuals = y0 - np.matmul(x0, beta)[..., 0]
+    residuals[~valid] = np.nan
+    return residuals
+
+
+def neutralize(panel, exposures=(), intercept: bool = True, groups=None):
+    """residuals of the cross-sectional regression of each date on the
+    exposures and the group dummies, solved for blocks of dates at once
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+    exposures : sequence
+        panels aligned with panel, scalars are broadcast
+    intercept : bool
+        add a constant exposure, implied by the group dummies
+    groups : pd.DataFrame or np.ndarray, optional
+        group labels (industries for instance) aligned with panel, missing
+        labels are missing values
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        residuals, nan where the value, an exposure or the group is missing
+    """
+    y = _values(panel)
+    codes = None
+    if groups is not None:
+        codes = pd.factorize(np.asarray(groups).ravel())[0].reshape(y.shape)
+        intercept = False
+    columns = [np.broadcast_to(_values(exposure), y.shape) for exposure in exposures]
+    if intercept:
+        columns.insert(0, np.ones(y.shape))
+    residuals = np.empty_like(y)
+    step = max(1, _BLOCK_CELLS // max(1, y.shape[1] * len(columns)))
+    for start in range(0, y.shape[0], step):
+        block = slice(start, start + step)
+        x = np.stack([column[block] for column in columns], axis=-1) if columns \
+            else np.empty(y[block].shape + (0,))
+        residuals[block] = _residuals(y[block], x, intercept,
+                                      None if codes is None else codes[block])
+    return _like(residuals, panel)
+
+
+def orthogonalize(panel, factors):
+    """z-score of the part of panel not explained by the factors: panel and
+    factors are z-scored, panel is neutralized against the factors and the
+    residual z-scored again. Equivalent to Gram-Schmidt orthogonalisation of
+    standardized factors
+
+    Parameters
+    ----------
+    panel : pd.DataFrame or np.ndarray
+        dates as rows and assets as columns
+    factors : sequence
+        panels aligned with panel
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        orthogonalized factor, same shape as panel
+    """
+    residuals = neutralize(zscore(_values(panel)), [zscore(_values(factor)) for factor in factors])
+    return _like(zscore(residuals), panel)
+
+
+def combine(panels, weights=None):
+    """weighted sum of z-scored factors, equal weights by default (IC
+    weights for an IC weighted combination)
+
+    Parameters
+    ----------
+    panels : sequence
+        aligned panels, dates as rows and assets as columns
+    weights : sequence[float], optional
+        weight of each panel
+
+    Returns
+    -------
+    pd.DataFrame or np.ndarray
+        combined factor, nan where every panel is missing
+    """
+    panels = list(panels)
+    if weights is None:
+        weights = np.ones(len(panels))
+    combined = np.zeros(np.shape(panels[0]))
+    missing = np.ones(combined.shape, dtype=bool)
+    for panel, weight in zip(panels, weights):
+        score = zscore(_values(panel))
+        valid = ~np.isnan(score)
+        combined[valid] += weight * score[valid]
+        missing &= ~valid
+    combined[missing] = np.nan
+    return _like(combined, panels[0])
@@ -5,6 +5,8 @@ import statsmodels.formula.api as smf
 import statsmodels.api as sm
 import talib
 
+from . import cross_section
+
 
 def pivot_table(A: pd.DataFrame) -> pd.DataFrame:
     """Transvert  A  to single index
@@ -13,6 +15,9 @@ def pivot_table(A: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: data with single-index
     """
+    if A.index.is_unique:
+        # same table as pivot_table without its groupby
+        return A['factor'].unstack('asset').astype(float)
     return pd.pivot_table(A, values='factor', index='date', columns='asset',
                           fill_value=np.nan, dropna=False)
 
@@ -29,6 +34,21 @@ def stack_table(A: pd.DataFrame) -> pd.DataFrame:
     return A
 
 
+def _unpivot_like(At: pd.DataFrame, A: pd.DataFrame) -> pd.DataFrame:
+    """values of the wide table At at the rows of A: unlike stack_table, the
+    (date, asset) missing from A are not added
+    Args:
+        At (pd.DataFrame): data with single-index, dates and assets of A
+        A (pd.DataFrame): data with multi-index
+    Returns:
+        pd.DataFrame: data with the multi-index of A
+    """
+    index = A.index
+    rows = At.index.get_indexer(index.levels[0])[index.codes[0]]
+    columns = At.columns.get_indexer(index.levels[1])[index.codes[1]]
+    return pd.DataFrame({'factor': At.values[rows, columns]}, index=index)
+
+
 def RANK(A: pd.DataFrame) -> pd.DataFrame:
     """sorting cross-section
     Args:
@@ -36,7 +56,9 @@ def RANK(A: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: factor data with multi-index
     """
-    return A.groupby('date').rank()+1
+    if not A.index.is_unique:
+        return A.groupby('date').rank()+1
+    return _unpivot_like(pivot_table(A).rank(axis=1)+1, A)
 
 
 def MAX(A: pd.DataFrame, B: pd.DataFrame) -> pd.DataFrame:
@@ -499,3 +521,106 @@ def COUNT(condition: pd.DataFrame, n: int):
         n (int): the number of past days
     """
     return condition.rolling(n, center=False, min_periods=n).sum()
+
+
+def _aligned(B, At: pd.DataFrame):
+    """B as a wide table aligned with the wide table At, scalars unchanged
+    """
+    if isinstance(B, pd.DataFrame):
+        return pivot_table(B).reindex(index=At.index, columns=At.columns)
+    return B
+
+
+def ZSCORE(A: pd.DataFrame) -> pd.DataFrame:
+    """z-score (Cross Section)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+    Returns:
+        pd.DataFrame: (A - date mean) / date std with multi-index
+    """
+    return stack_table(cross_section.zscore(pivot_table(A)))
+
+
+def WINSORIZE(A: pd.DataFrame, lower=0.025, upper=None) -> pd.DataFrame:
+    """clip to the percentiles of each date (Cross Section)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+        lower: lower quantile
+        upper: values above the 1-upper quantile are clipped, default lower
+    Returns:
+        pd.DataFrame: factor data with multi-index
+    """
+    return stack_table(cross_section.winsorize(pivot_table(A), lower, upper))
+
+
+def NEUTRALIZE(A: pd.DataFrame, *B) -> pd.DataFrame:
+    """residual of the regression of A on B and a constant, each date
+    (Cross Section). Non numeric exposures such as INDUSTRY are groups,
+    regressed on as dummies: NEUTRALIZE(A, INDUSTRY, LOG(CAP)). Numeric
+    exposures are continuous, group codes must be given as labels (str)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+        B (pd.DataFrame): exposures with multi-index, any number of them and
+            at most one of groups
+    Returns:
+        pd.DataFrame: residual data with multi-index
+    """
+    At = pivot_table(A)
+    exposures = []
+    groups = None
+    for b in B:
+        if b is None:
+            raise ValueError('NEUTRALIZE exposure is None, the data source has no data for it '
+                             '(e.g. INDUSTRY without industry data)')
+        if isinstance(b, pd.DataFrame) and not pd.api.types.is_numeric_dtype(b['factor']):
+            if groups is not None:
+                raise ValueError('NEUTRALIZE takes at most one group exposure')
+            groups = b['factor'].unstack('asset').reindex(index=At.index, columns=At.columns)
+        else:
+            exposures.append(_aligned(b, At))
+    return stack_table(cross_section.neutralize(At, exposures, groups=groups))
+
+
+def ORTHO(A: pd.DataFrame, *B) -> pd.DataFrame:
+    """z-scored A orthogonalized against the z-scored factors B, each date
+    (Cross Section)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+        B (pd.DataFrame): factor data with multi-index, any number of them
+    Returns:
+        pd.DataFrame: orthogonalized factor data with multi-index
+    """
+    At = pivot_table(A)
+    return stack_table(cross_section.orthogonalize(At, [_aligned(b, At) for b in B]))
+
+
+def MADCLIP(A: pd.DataFrame, n=3) -> pd.DataFrame:
+    """clip to median +/- n * 1.4826 * MAD of each date (Cross Section)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+        n: number of scaled median absolute deviations
+    Returns:
+        pd.DataFrame: factor data with multi-index
+    """
+    return stack_table(cross_section.mad_clip(pivot_table(A), n))
+
+
+def SCALE(A: pd.DataFrame, a=1) -> pd.DataFrame:
+    """scale so that the absolute values of each date sum to a (Cross Section)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+        a: gross sum of each date
+    Returns:
+        pd.DataFrame: factor data with multi-index
+    """
+    return stack_table(cross_section.scale(pivot_table(A), a))
+
+
+def FILLNA(A: pd.DataFrame) -> pd.DataFrame:
+    """fill missing values with the median of their date (Cross Section)
+    Args:
+        A (pd.DataFrame): factor data with multi-index
+    Returns:
+        pd.DataFrame: factor data with multi-index
+    """
+    return stack_table(cross_section.fillna_median(pivot_table(A)))
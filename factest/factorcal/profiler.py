@@ -0,0 +1,187 @@
+import ast
+import copy
+import time
+import tracemalloc
+
+import pandas as pd
+
+_ATOMIC_NODES = (ast.Name, ast.Call, ast.Constant, ast.Attribute, ast.Subscript)
+
+
+def _shape(value) -> str:
+    shape = getattr(value, 'shape', None)
+    return None if shape is None else 'x'.join(str(n) for n in shape)
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    return getattr(value, 'nbytes', None)
+
+
+class _Measure():
+    """one node evaluation
+    """
+
+    def __init__(self, profile, key, node, name, args):
+        self.profile = profile
+        self.key = key
+        self.node = node
+        self.name = name
+        self.args = args
+        self.output = None
+
+    def __enter__(self):
+        if self.profile.memory:
+            self.__memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.__start
+        peak = None
+        if self.profile.memory:
+            peak = tracemalloc.get_traced_memory()[1] - self.__memory
+        self.profile._record(self, elapsed, peak)
+        return False
+
+
+class _NoMeasure():
+    """measure used when profiling is off
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_MEASURE = _NoMeasure()
+
+
+class FormulaProfile():
+    """per formula node statistics: calls, cache hits, input and output
+    shapes, time spent in the node itself (its arguments excluded), peak
+    memory allocated while computing it and output size
+    """
+
+    def __init__(self, tree: ast.Expression = None, memory: bool = True):
+        self.tree = tree
+        self.memory = memory
+        self.__stats = {}
+        self.__started_tracemalloc = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracemalloc = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__started_tracemalloc:
+            tracemalloc.stop()
+            self.__started_tracemalloc = False
+        return False
+
+    def __node_stats(self, key: str, node: ast.AST, name: str) -> dict:
+        if key not in self.__stats:
+            self.__stats[key] = {
+                'expr': ast.unparse(node), 'operator': name, 'calls': 0, 'cache_hits': 0,
+                'input_shape': None, 'output_shape': None, 'time': 0.0,
+                'peak_bytes': None, 'output_bytes': None,
+            }
+        return self.__stats[key]
+
+    def measure(self, key: str, node: ast.AST, name: str, args) -> _Measure:
+        """context manager timing one evaluation of a node, set the output
+        attribute of the returned measure to the node value
+        """
+        return _Measure(self, key, node, name, args)
+
+    def hit(self, key: str, node: ast.AST):
+        """node value taken from the cache of shared sub-expressions
+        """
+        stats = self.__node_stats(key, node, None)
+        stats['cache_hits'] += 1
+
+    def _record(self, measure: _Measure, elapsed: float, peak: int):
+        stats = self.__node_stats(measure.key, measure.node, measure.name)
+        stats['operator'] = measure.name
+        stats['calls'] += 1
+        stats['time'] += elapsed
+        shapes = [_shape(arg) for arg in measure.args]
+        shapes = [shape for shape in shapes if shape is not None]
+        if shapes:
+            stats['input_shape'] = ', '.join(shapes)
+        stats['output_shape'] = _shape(measure.output)
+        stats['output_bytes'] = _nbytes(measure.output)
+        if peak is not None:
+            stats['peak_bytes'] = max(peak, stats['peak_bytes'] or 0)
+
+    @property
+    def total_time(self) -> float:
+        return sum(stats['time'] for stats in self.__stats.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """node statistics, most expensive first
+
+        Returns
+        -------
+        pd.DataFrame
+            expr, operator, calls, cache_hits, input_shape, output_shape,
+            time (seconds), share (of the total time), peak_bytes and
+            output_bytes of each evaluated node
+        """
+        table = pd.DataFrame(list(self.__stats.values()), columns=[
+            'expr', 'operator', 'calls', 'cache_hits', 'input_shape', 'output_shape',
+            'time', 'peak_bytes', 'output_bytes'])
+        total = self.total_time
+        table.insert(7, 'share', table['time'] / total if total > 0 else 0.0)
+        return table.sort_values('time', ascending=False).reset_index(drop=True)
+
+    def annotate(self, min_share: float = 0.01) -> str:
+        """the formula with the time and share of each node written after it,
+        like 'DELTA(CLOSE, 5){12.1ms 40%}'
+
+        Parameters
+        ----------
+        min_share : float
+            nodes taking a smaller share of the total time are not annotated
+        """
+        total = self.total_time
+        node_stats = self.__stats
+
+        def label(key):
+            stats = node_stats[key]
+            text = '{:.1f}ms {:.0%}'.format(stats['time'] * 1e3,
+                                            stats['time'] / total if total > 0 else 0)
+            if stats['cache_hits']:
+                text += ' hits={}'.format(stats['cache_hits'])
+            return '{' + text + '}'
+
+        class Annotator(ast.NodeTransformer):
+
+            def generic_visit(self_, node):
+                key = ast.dump(node)
+                node = super(Annotator, self_).generic_visit(node)
+                if key not in node_stats or isinstance(node, ast.Constant):
+                    return node
+                if total > 0 and node_stats[key]['time'] / total < min_share:
+                    return node
+                source = ast.unparse(node)
+                if not isinstance(node, _ATOMIC_NODES):
+                    source = '(' + source + ')'
+                return ast.copy_location(ast.Name(id=source + label(key), ctx=ast.Load()), node)
+
+        tree = Annotator().visit(copy.deepcopy(self.tree))
+        return ast.unparse(tree)
+
+    def __repr__(self):
+        return self.annotate() + '\n' + self.to_frame().to_string()
@@ -1,11 +1,15 @@
+import ast
+import operator
 import re
 import pandas as pd
 
 from ..data_service.base_data import BaseDataSource
+from ..trace import span, rows
+from .profiler import FormulaProfile, _NO_MEASURE
 from .operator import *
 
 
-def calculate_factor(data: BaseDataSource, formula: str, data_key_words) -> pd.DataFrame:
+def calculate_factor(data: BaseDataSource, formula: str, data_key_words, trace=None) -> pd.DataFrame:
     """calculate factor values
 
     Parameters
@@ -16,12 +20,17 @@ def calculate_factor(data: BaseDataSource, formula: str, data_key_words) -> pd.D
         formulte to calculte factor value
     data_key_words :
         data keywords sequence
+    trace : Trace, optional
+        records a span per data field load and per operator call
 
     Returns
     -------
     pd.DataFrame
         actor value with multi-index
     """
+    if trace is not None:
+        tree = _parse_formula(formula)
+        return _FormulaEvaluator(data, [tree], data_key_words, trace).evaluate(tree)
 
     data_pattern = '[^A-Za-z\u4e00-\u9fa5]+'
 
@@ -33,3 +42,245 @@ def calculate_factor(data: BaseDataSource, formula: str, data_key_words) -> pd.D
     # to void AttributeError. The reason is unkown
     formula = '(' + formula.strip() + ')*1'
     return eval(formula)
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Invert: operator.invert,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+def _parse_formula(formula: str) -> ast.Expression:
+    """parse formula, wrapped as calculate_factor does
+    """
+    return ast.parse('(' + formula.strip() + ')*1', mode='eval')
+
+
+def _shared_nodes(node: ast.AST, data_key_words):
+    """nodes whose value can be computed once and shared: data fields,
+    operator calls and arithmetic
+    """
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id in data_key_words:
+            yield child
+        elif isinstance(child, (ast.Call, ast.BinOp, ast.UnaryOp, ast.Compare)):
+            yield child
+
+
+class _FormulaEvaluator():
+    """evaluate formulas node by node, keeping the values of the data fields
+    and sub-expressions used more than once
+    """
+
+    def __init__(self, data: BaseDataSource, trees, data_key_words, trace=None, profile=None):
+        self.__data = data
+        self.__trace = trace
+        self.__profile = profile
+        self.__data_key_words = set(data_key_words)
+        self.__namespace = dict(globals())
+        self.__cache = {}
+        self.__uses = {}
+        for tree in trees:
+            for node in _shared_nodes(tree.body, self.__data_key_words):
+                key = ast.dump(node)
+                self.__uses[key] = self.__uses.get(key, 0) + 1
+
+    def evaluate(self, tree: ast.Expression):
+        return self.__evaluate(tree.body)
+
+    def __release(self, node: ast.AST):
+        """a cached node has been used: its sub-expressions will not be
+        evaluated for this use
+        """
+        for child in _shared_nodes(node, self.__data_key_words):
+            if child is node:
+                continue
+            key = ast.dump(child)
+            self.__uses[key] -= 1
+            if self.__uses[key] == 0:
+                self.__cache.pop(key, None)
+
+    def __evaluate(self, node: ast.AST):
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        key = ast.dump(node)
+        shared = key in self.__uses
+        if shared:
+            self.__uses[key] -= 1
+            if key in self.__cache:
+                if self.__profile is not None:
+                    self.__profile.hit(key, node)
+                value = self.__cache[key]
+                if self.__uses[key] == 0:
+                    del self.__cache[key]
+                self.__release(node)
+                return value
+
+        value = self.__compute(node)
+
+        if shared and self.__uses[key] > 0:
+            self.__cache[key] = value
+        return value
+
+    def __apply(self, node: ast.AST, name: str, category: str, func, *args, **kwargs):
+        """call func for node, timed by the trace and the profile. Arguments
+        are evaluated before: they are timed on their own
+        """
+        if self.__trace is None and self.__profile is None:
+            return func(*args, **kwargs)
+        measure = _NO_MEASURE
+        if self.__profile is not None:
+            measure = self.__profile.measure(ast.dump(node), node, name, args)
+        with span(self.__trace, name, category, expr=ast.unparse(node)) as s, measure as m:
+            value = func(*args, **kwargs)
+            s.rows = rows(value)
+            m.output = value
+        return value
+
+    def __compute(self, node: ast.AST):
+        if isinstance(node, ast.Name):
+            if node.id in self.__data_key_words:
+                return self.__apply(node, node.id, 'data', getattr, self.__data, node.id)
+            if node.id in self.__namespace:
+                return self.__namespace[node.id]
+            return eval(node.id, self.__namespace)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            return self.__apply(node, type(node.op).__name__, 'operator',
+                                _BINARY_OPERATORS[type(node.op)],
+                                self.__evaluate(node.left), self.__evaluate(node.right))
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            return self.__apply(node, type(node.op).__name__, 'operator',
+                                _UNARY_OPERATORS[type(node.op)], self.__evaluate(node.operand))
+
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 \
+                and type(node.ops[0]) in _COMPARE_OPERATORS:
+            return self.__apply(node, type(node.ops[0]).__name__, 'operator',
+                                _COMPARE_OPERATORS[type(node.ops[0])],
+                                self.__evaluate(node.left), self.__evaluate(node.comparators[0]))
+
+        if isinstance(node, ast.Call) and not any(
+                isinstance(arg, ast.Starred) for arg in node.args) and all(
+                keyword.arg is not None for keyword in node.keywords):
+            func = self.__evaluate(node.func)
+            args = [self.__evaluate(arg) for arg in node.args]
+            kwargs = {keyword.arg: self.__evaluate(keyword.value)
+                      for keyword in node.keywords}
+            return self.__apply(node, getattr(func, '__name__', 'call'), 'operator',
+                                func, *args, **kwargs)
+
+        # any other expression is evaluated as a whole
+        namespace = dict(self.__namespace)
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and child.id in self.__data_key_words:
+                key = ast.dump(child)
+                namespace[child.id] = self.__cache[key] if key in self.__cache \
+                    else getattr(self.__data, child.id)
+        self.__release(node)
+        return eval(compile(ast.Expression(node), '<formula>', 'eval'), namespace)
+
+
+def calculate_factors(data: BaseDataSource, formulas: dict, data_key_words, trace=None,
+                      errors: str = 'raise'):
+    """calculate several factors at once. Each data field is loaded once and
+    the sub-expressions appearing in more than one place are computed once,
+    their values are dropped as soon as no remaining formula needs them
+
+    Parameters
+    ----------
+    data : BaseDataSource
+        data object
+    formulas : dict
+        factor name to formula
+    data_key_words :
+        data keywords sequence
+    trace : Trace, optional
+        records a span per data field load and per operator call
+    errors : str
+        'raise' raises the error of a formula failing to parse or evaluate,
+        'yield' yields the exception in place of its values and goes on with
+        the next formulas
+
+    Yields
+    ------
+    tuple
+        factor name and factor values with multi-index, in 'formulas' order
+    """
+    if errors not in ('raise', 'yield'):
+        raise ValueError("errors must be 'raise' or 'yield'")
+
+    trees = {}
+    for name, formula in formulas.items():
+        try:
+            trees[name] = _parse_formula(formula)
+        except SyntaxError as e:
+            if errors == 'raise':
+                raise
+            trees[name] = e
+    evaluator = _FormulaEvaluator(
+        data, [tree for tree in trees.values() if not isinstance(tree, Exception)],
+        data_key_words, trace)
+    for name, tree in trees.items():
+        if isinstance(tree, Exception):
+            yield name, tree
+            continue
+        try:
+            value = evaluator.evaluate(tree)
+        except Exception as e:
+            if errors == 'raise':
+                raise
+            value = e
+        yield name, value
+
+
+def profile_formula(data: BaseDataSource, formula: str, data_key_words, memory: bool = True) -> FormulaProfile:
+    """evaluate a formula node by node and measure each node: call count,
+    cache hits, input shape, time, allocated memory and output size
+
+    Parameters
+    ----------
+    data : BaseDataSource
+        data object
+    formula : str
+        formula to profile
+    data_key_words :
+        data keywords sequence
+    memory : bool
+        trace memory allocations with tracemalloc, which slows down pure
+        python operators
+
+    Returns
+    -------
+    FormulaProfile
+        to_frame() gives the nodes sorted by time, annotate() the formula
+        with the time of each node
+    """
+    tree = ast.parse(formula.strip(), mode='eval')
+    with FormulaProfile(tree, memory) as profile:
+        _FormulaEvaluator(data, [tree], data_key_words, profile=profile).evaluate(tree)
+    return profile
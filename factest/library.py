@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+from .screening import _row_corr, _row_rank
+
+
+class FactorLibrary():
+    """factors ranked once on a common (date x asset) grid, with the matrix of
+    their mean cross-sectional rank correlations. Adding a factor only
+    correlates it with the factors already in the library
+    """
+
+    def __init__(self, dates=None, assets=None):
+        self.__dates = None if dates is None else pd.Index(dates)
+        self.__assets = None if assets is None else pd.Index(assets)
+        self.__ranks = {}
+        self.__corr = pd.DataFrame(dtype=float)
+
+    @property
+    def names(self) -> list:
+        return list(self.__ranks)
+
+    @property
+    def dates(self) -> pd.Index:
+        return self.__dates
+
+    @property
+    def assets(self) -> pd.Index:
+        return self.__assets
+
+    def __len__(self):
+        return len(self.__ranks)
+
+    def __contains__(self, name) -> bool:
+        return name in self.__ranks
+
+    def corr(self) -> pd.DataFrame:
+        """mean per date rank correlation of every pair of factors
+        """
+        return self.__corr.copy()
+
+    def __rank(self, factor: pd.DataFrame) -> np.ndarray:
+        if self.__dates is None:
+            self.__dates = factor.index
+        if self.__assets is None:
+            self.__assets = factor.columns
+        values = factor.reindex(index=self.__dates, columns=self.__assets).to_numpy(dtype=float)
+        return _row_rank(values).astype(np.float32)
+
+    def __correlate(self, ranks: np.ndarray) -> pd.Series:
+        ranks = ranks.astype(float)
+        return pd.Series({name: np.nanmean(_row_corr(ranks, other.astype(float)))
+                          for name, other in self.__ranks.items()}, dtype=float)
+
+    def correlation(self, factor: pd.DataFrame) -> pd.Series:
+        """mean per date rank correlation of a factor with each library factor,
+        the factor is not added
+
+        Parameters
+        ----------
+        factor : pd.DataFrame
+            factor values, dates as index and assets as columns
+
+        Returns
+        -------
+        pd.Series
+            correlation indexed by library factor name
+        """
+        return self.__correlate(self.__rank(factor))
+
+    def add(self, name, factor: pd.DataFrame) -> pd.Series:
+        """rank a factor and add it to the library
+
+        Parameters
+        ----------
+        name :
+            factor name, an existing factor of the same name is replaced
+        factor : pd.DataFrame
+            factor values, dates as index and assets as columns. Values outside
+            the library grid are ignored
+
+        Returns
+        -------
+        pd.Series
+            correlation with the factors already in the library
+        """
+        if name in self.__ranks:
+            self.remove(name)
+        ranks = self.__rank(factor)
+        correlation = self.__correlate(ranks)
+        self.__ranks[name] = ranks
+
+        names = self.names
+        corr = self.__corr.reindex(index=names, columns=names)
+        corr.loc[name, correlation.index] = correlation
+        corr.loc[correlation.index, name] = correlation
+        corr.loc[name, name] = 1.0
+        self.__corr = corr
+        return correlation
+
+    def remove(self, name):
+        del self.__ranks[name]
+        self.__corr = self.__corr.drop(index=name, columns=name)
+
+    def prune(self, threshold: float = 0.7, scores=None) -> list:
+        """see prune_factors
+        """
+        return prune_factors(self.__corr, threshold, scores)
+
+    def save(self, path: str):
+        """write the library to a .npz file
+
+        Parameters
+        ----------
+        path : str
+            file path
+        """
+        names = self.names
+        arrays = {'factor_{}'.format(i): self.__ranks[name] for i, name in enumerate(names)}
+        np.savez(path, names=np.array([str(name) for name in names]),
+                 dates=self.__dates.to_numpy(dtype='datetime64[ns]'),
+                 assets=np.array([str(asset) for asset in self.__assets]),
+                 corr=self.__corr.to_numpy(dtype=float), **arrays)
+
+    @classmethod
+    def load(cls, path: str):
+        """read a library written by save
+
+        Parameters
+        ----------
+        path : str
+            file path
+
+        Returns
+        -------
+        FactorLibrary
+            library, factor names and assets as strings
+        """
+        with np.load(path) as stored:
+            library = cls(pd.DatetimeIndex(stored['dates']), pd.Index(stored['assets']))
+            names = [str(name) for name in stored['names']]
+            for i, name in enumerate(names):
+                library.__ranks[name] = stored['factor_{}'.format(i)]
+            library.__corr = pd.DataFrame(stored['corr'], index=names, columns=names)
+        return library
+
+
+def factor_correlation(factors) -> pd.DataFrame:
+    """mean per date rank correlation matrix of several factors
+
+    Parameters
+    ----------
+    factors : dict or iterable
+        factor name to factor values (dates as index and assets as columns),
+        or (name, values) pairs
+
+    Returns
+    -------
+    pd.DataFrame
+        correlation matrix
+    """
+    if isinstance(factors, dict):
+        factors = factors.items()
+    library = FactorLibrary()
+    for name, factor in factors:
+        library.add(name, factor)
+    return library.corr()
+
+
+def prune_factors(corr: pd.DataFrame, threshold: float = 0.7, scores=None) -> list:
+    """greedy pruning of redundant factors: factors are visited by decreasing
+    score and kept if their absolute correlation with every factor kept so
+    far is at most threshold
+
+    Parameters
+    ----------
+    corr : pd.DataFrame
+        factor correlation matrix
+    threshold : float
+        maximum absolute correlation between kept factors
+    scores : pd.Series, optional
+        factor quality (absolute ICIR for instance), by default factors are
+        visited in the matrix order
+
+    Returns
+    -------
+    list
+        kept factors
+    """
+    order = list(corr.index)
+    if scores is not None:
+        order = list(pd.Series(scores).reindex(order).sort_values(ascending=False, kind='mergesort').index)
+    kept = []
+    for name in order:
+        # pairs without common data (nan) are not redundant
+        if not any(abs(corr.loc[name, other]) > threshold for other in kept):
+            kept.append(name)
+    return kept
@@ -29,5 +29,6 @@ DATA_KEY_WORDS = [
     'RET',
     'CAP',
     'HIGHLIMIT',
-    'LOWLIMIT'
+    'LOWLIMIT',
+    'INDUSTRY'
 ]
@@ -0,0 +1,207 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+import base64
+import html
+import io
+import os
+import warnings
+
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.backends import backend_agg
+
+REPORT_FORMATS = ['png', 'svg', 'html']
+
+# FactorTest of the worker process, unpickled once by the pool initializer
+_worker_test = None
+
+
+def _init_worker(test):
+    global _worker_test
+    matplotlib.use('Agg', force=True)
+    _worker_test = test
+
+
+@contextmanager
+def _agg_figures():
+    """new pyplot figures get an Agg canvas and plt.show() does nothing. The
+    pyplot backend and the figures already open are left as they are
+    """
+    def new_agg_figure_manager(*args, **kwargs):
+        return backend_agg.new_figure_manager(*args, **kwargs)
+
+    def show(*args, **kwargs):
+        pass
+
+    with plt.ioff():
+        # pyplot loads its backend on first use and closes every figure then:
+        # load it before any Agg figure is open (draws nothing, not interactive)
+        plt.draw_if_interactive()
+        pyplot_new_figure_manager, pyplot_show = plt.new_figure_manager, plt.show
+        plt.new_figure_manager, plt.show = new_agg_figure_manager, show
+        try:
+            yield
+        finally:
+            plt.new_figure_manager, plt.show = pyplot_new_figure_manager, pyplot_show
+
+
+def render_chart(test, chart: str, image_format: str = 'png'):
+    """render one FactorTest chart off screen. Every figure the chart opens is
+    saved and closed, whatever happens while drawing
+
+    Parameters
+    ----------
+    test : FactorTest
+        analysed factor test
+    chart : str
+        chart name, FactorTest.plot_<chart> draws it
+    image_format : str
+        'png' or 'svg'
+
+    Returns
+    -------
+    tuple
+        chart name, list of images (bytes), printed text (tables)
+    """
+    before = set(plt.get_fignums())
+    text = io.StringIO()
+    try:
+        with redirect_stdout(text), warnings.catch_warnings(), _agg_figures():
+            warnings.simplefilter('ignore', UserWarning)
+            getattr(test, 'plot_' + chart)()
+        images = []
+        for num in plt.get_fignums():
+            if num in before:
+                continue
+            buffer = io.BytesIO()
+            plt.figure(num).savefig(buffer, format=image_format, bbox_inches='tight')
+            images.append(buffer.getvalue())
+    finally:
+        for num in plt.get_fignums():
+            if num not in before:
+                plt.close(num)
+    return chart, images, text.getvalue()
+
+
+def _render_worker_chart(chart: str, image_format: str):
+    return render_chart(_worker_test, chart, image_format)
+
+
+def _render_html(title: str, rendered: list, image_format: str) -> str:
+    """single html page with all the charts, images are embedded
+    """
+    parts = ['<html><head><meta charset="utf-8"><title>{}</title></head><body>'.format(html.escape(title)),
+             '<h1>{}</h1>'.format(html.escape(title))]
+    for chart, images, text in rendered:
+        parts.append('<h2>{}</h2>'.format(html.escape(chart)))
+        if text.strip():
+            parts.append('<pre>{}</pre>'.format(html.escape(text)))
+        for image in images:
+            if image_format == 'svg':
+                parts.append(image.decode('utf-8'))
+            else:
+                parts.append('<img src="data:image/png;base64,{}"/>'.format(
+                    base64.b64encode(image).decode('ascii')))
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def render_report(test, charts: list, path: str, fmt: str = 'html', processes: int = None,
+                  title: str = None) -> list:
+    """render FactorTest charts on Agg canvases, without changing the pyplot
+    backend or closing the figures already open
+
+    Parameters
+    ----------
+    test : FactorTest
+        analysed factor test
+    charts : list
+        chart names, FactorTest.plot_<chart> draws each of them
+    path : str
+        html file path for 'html', output directory for 'png' and 'svg'
+    fmt : str
+        'html' (single file, png images embedded), 'png' or 'svg' (one file
+        per figure, tables printed by the chart in a .txt file)
+    processes : int, optional
+        number of worker processes rendering the charts in parallel, each
+        worker gets a pickled copy of test. By default charts are rendered in
+        the calling process
+    title : str, optional
+        html page title, the factor formula by default
+
+    Returns
+    -------
+    list
+        written file paths
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError('fmt must be one of {}'.format(REPORT_FORMATS))
+    image_format = 'png' if fmt == 'html' else fmt
+
+    if processes is None or processes <= 1 or len(charts) <= 1:
+        rendered = [render_chart(test, chart, image_format) for chart in charts]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(test,)) as executor:
+            futures = [executor.submit(_render_worker_chart, chart, image_format)
+                       for chart in charts]
+            rendered = [future.result() for future in futures]
+
+    if fmt == 'html':
+        if title is None:
+            title = str(test.formula)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_render_html(title, rendered, image_format))
+        return [path]
+
+    os.makedirs(path, exist_ok=True)
+    written = []
+    for chart, images, text in rendered:
+        for i, image in enumerate(images):
+            name = chart if len(images) == 1 else '{}_{}'.format(chart, i)
+            file_path = os.path.join(path, '{}.{}'.format(name, fmt))
+            with open(file_path, 'wb') as f:
+                f.write(image)
+            written.append(file_path)
+        if text.strip():
+            file_path = os.path.join(path, chart + '.txt')
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            written.append(file_path)
+    return written
+
+
+def _render_test_report(test, charts, path, fmt, title):
+    matplotlib.use('Agg', force=True)
+    return render_report(test, charts, path, fmt, processes=None, title=title)
+
+
+def render_reports(tests: dict, output_dir: str, fmt: str = 'html', processes: int = None) -> dict:
+    """render the reports of several factor tests, one worker process per
+    factor test at a time
+
+    Parameters
+    ----------
+    tests : dict
+        report name to analysed FactorTest
+    output_dir : str
+        output directory, each report is written to <name>.html (html) or to
+        the <name> sub directory (png, svg)
+    fmt : str
+        'html', 'png' or 'svg', see render_report
+    processes : int, optional
+        number of worker processes, by default one per CPU
+
+    Returns
+    -------
+    dict
+        report name to written file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {}
+        for name, test in tests.items():
+            path = os.path.join(output_dir, name + '.html' if fmt == 'html' else name)
+            futures[name] = executor.submit(
+                _render_test_report, test, test.report_charts(), path, fmt, name)
+        return {name: future.result() for name, future in futures.items()}
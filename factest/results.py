@@ -0,0 +1,146 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def _json_value(value):
+    """numpy scalars and containers to plain json values
+    """
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Index)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        value = float(value)
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, np.bool_):
+        return bool(value)
+    return value
+
+
+def _write_table(path: str, name: str, table: pd.DataFrame) -> dict:
+    """write one table to <name>.parquet. Parquet needs string column names,
+    the original column labels are kept in the returned manifest entry
+    """
+    columns = table.columns
+    stored = table.copy(deep=False)
+    stored.columns = [str(c) for c in columns]
+    stored.to_parquet(os.path.join(path, name + '.parquet'))
+    return {'file': name + '.parquet',
+            'columns': _json_value(columns),
+            'columns_name': columns.name}
+
+
+def _read_table(path: str, entry: dict) -> pd.DataFrame:
+    table = pd.read_parquet(os.path.join(path, entry['file']))
+    table.columns = pd.Index(entry['columns'], name=entry['columns_name'])
+    return table
+
+
+def write_results(path: str, tables: dict, scalars: dict):
+    """write analysis results to a directory: one parquet file per table and
+    a json manifest with the scalars
+
+    Parameters
+    ----------
+    path : str
+        output directory
+    tables : dict
+        artefact name to pd.DataFrame, or to a dict of pd.DataFrame which is
+        stored as one table with the keys as first index level
+    scalars : dict
+        json serializable values
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest = {'scalars': _json_value(scalars), 'tables': {}}
+    for name, table in tables.items():
+        if isinstance(table, dict):
+            keys = list(table)
+            entry = _write_table(path, name, pd.concat([table[k] for k in keys],
+                                                       keys=[str(k) for k in keys]))
+            entry['keys'] = _json_value(keys)
+        else:
+            entry = _write_table(path, name, table)
+        manifest['tables'][name] = entry
+    with open(os.path.join(path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+class FactorTestResults():
+    """read-only analysis results written by FactorTest.export_results.
+    Tables are read on first access and returned as copies
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        object.__setattr__(self, '_FactorTestResults__path', path)
+        object.__setattr__(self, '_FactorTestResults__scalars', manifest['scalars'])
+        object.__setattr__(self, '_FactorTestResults__entries', manifest['tables'])
+        object.__setattr__(self, '_FactorTestResults__tables', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FactorTestResults is read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError('FactorTestResults is read-only')
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str):
+        if name not in self.__entries:
+            raise KeyError('{} was not computed'.format(name))
+        if name not in self.__tables:
+            entry = self.__entries[name]
+            table = _read_table(self.__path, entry)
+            if 'keys' in entry:
+                table = {k: table.xs(str(k), level=0) for k in entry['keys']}
+            self.__tables[name] = table
+        table = self.__tables[name]
+        if isinstance(table, dict):
+            return {k: v.copy() for k, v in table.items()}
+        return table.copy()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__entries
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(self.__entries)
+
+    @property
+    def tables(self) -> list:
+        """names of the stored tables
+        """
+        return list(self.__entries)
+
+    @property
+    def scalars(self) -> dict:
+        """configuration and summary statistics
+        """
+        return json.loads(json.dumps(self.__scalars))
+
+
+def load_results(path: str) -> FactorTestResults:
+    """load analysis results written by FactorTest.export_results
+
+    Parameters
+    ----------
+    path : str
+        results directory
+
+    Returns
+    -------
+    FactorTestResults
+        read-only results
+    """
+    return FactorTestResults(path)
@@ -0,0 +1,228 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .alphalens.utils import _wide_forward_returns
+
+SCREEN_COLUMNS = ['IC Mean', 'IC Std.', 'ICIR', 'IC t-stat', 'IC Positive Rate',
+                  'Rank Autocorrelation', 'Top Quantile Turnover']
+
+
+def _row_rank(values: np.ndarray, pct: bool = False) -> np.ndarray:
+    """average ranks of each row, nan stay nan
+    """
+    return pd.DataFrame(values).rank(axis=1, pct=pct).to_numpy()
+
+
+def _row_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation of each row of x with the same row of y, on the
+    cells where both are valid. nan for rows with less than 2 such cells
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    count = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(valid, x, 0.0).sum(axis=1) / count
+        y_mean = np.where(valid, y, 0.0).sum(axis=1) / count
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, y - y_mean[:, None], 0.0)
+        corr = (dx * dy).sum(axis=1) / np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+    corr[count < 2] = np.nan
+    return corr
+
+
+def _align(panel: pd.DataFrame, like: pd.DataFrame) -> np.ndarray:
+    return panel.reindex(index=like.index, columns=like.columns).to_numpy(dtype=float)
+
+
+def _period_length(label) -> int:
+    """number of days of a forward returns label: 5, '5D', '5 days'
+    """
+    if isinstance(label, (int, np.integer)):
+        return int(label)
+    match = re.match(r'\s*(\d+)', str(label))
+    return int(match.group(1)) if match else 1
+
+
+def rank_ic(factor: pd.DataFrame, forward_returns: pd.DataFrame) -> pd.Series:
+    """Spearman rank IC of each date, computed on all the dates at once
+
+    Parameters
+    ----------
+    factor : pd.DataFrame
+        factor values, dates as index and assets as columns
+    forward_returns : pd.DataFrame
+        forward returns, dates as index and assets as columns
+
+    Returns
+    -------
+    pd.Series
+        IC indexed by factor dates
+    """
+    x = factor.to_numpy(dtype=float)
+    y = _align(forward_returns, factor)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    # ranks over the assets having both values, like spearmanr on clean data
+    x = _row_rank(np.where(valid, x, np.nan))
+    y = _row_rank(np.where(valid, y, np.nan))
+    return pd.Series(_row_corr(x, y), index=factor.index)
+
+
+def ic_decay(factor: pd.DataFrame, returns: pd.DataFrame, lags=range(10)) -> pd.Series:
+    """mean rank IC of the factor against the returns 'lag' dates later,
+    showing how long the factor keeps its predictive power
+
+    Parameters
+    ----------
+    factor : pd.DataFrame
+        factor values, dates as index and assets as columns
+    returns : pd.DataFrame
+        one period forward returns, dates as index and assets as columns
+    lags : sequence[int]
+        lags in number of dates
+
+    Returns
+    -------
+    pd.Series
+        mean IC indexed by lag
+    """
+    returns = returns.reindex(index=factor.index, columns=factor.columns)
+    return pd.Series([rank_ic(factor, returns.shift(-lag)).mean() for lag in lags],
+                     index=pd.Index(list(lags), name='lag'))
+
+
+def rank_autocorrelation(factor: pd.DataFrame, period: int = 1) -> pd.Series:
+    """correlation of the factor ranks of each date with the ranks 'period'
+    dates before, a turnover proxy
+
+    Parameters
+    ----------
+    factor : pd.DataFrame
+        factor values, dates as index and assets as columns
+    period : int
+        lag in number of dates, at least 1
+
+    Returns
+    -------
+    pd.Series
+        autocorrelation indexed by factor dates
+    """
+    if period < 1:
+        raise ValueError('period must be a positive integer')
+    ranks = _row_rank(factor.to_numpy(dtype=float))
+    lagged = np.full_like(ranks, np.nan)
+    lagged[period:] = ranks[:-period]
+    return pd.Series(_row_corr(ranks, lagged), index=factor.index)
+
+
+def top_quantile_turnover(factor: pd.DataFrame, period: int = 1, quantiles: int = 5) -> pd.Series:
+    """share of the assets of the top quantile which were not in it 'period'
+    dates before
+
+    Parameters
+    ----------
+    factor : pd.DataFrame
+        factor values, dates as index and assets as columns
+    period : int
+        lag in number of dates, at least 1
+    quantiles : int
+        number of equal sized quantiles
+
+    Returns
+    -------
+    pd.Series
+        turnover indexed by factor dates
+    """
+    if period < 1:
+        raise ValueError('period must be a positive integer')
+    top = _row_rank(factor.to_numpy(dtype=float), pct=True) > 1 - 1 / quantiles
+    before = np.zeros_like(top)
+    before[period:] = top[:-period]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        turnover = (top & ~before).sum(axis=1) / top.sum(axis=1)
+    turnover[:period] = np.nan
+    return pd.Series(turnover, index=factor.index)
+
+
+def screen_factor(factor: pd.DataFrame, forward_returns: dict, quantiles: int = 5) -> pd.DataFrame:
+    """IC statistics and turnover proxies of a factor
+
+    Parameters
+    ----------
+    factor : pd.DataFrame
+        factor values, dates as index and assets as columns
+    forward_returns : dict
+        period (5, '5D') to forward returns, dates as index and assets as
+        columns
+    quantiles : int
+        number of quantiles of the top quantile turnover
+
+    Returns
+    -------
+    pd.DataFrame
+        periods on the index and SCREEN_COLUMNS on the columns. Rank
+        autocorrelation and turnover are computed with a lag of the period
+        length
+    """
+    rows = {}
+    for period, returns in forward_returns.items():
+        ic = rank_ic(factor, returns)
+        ic_mean = ic.mean()
+        ic_std = ic.std()
+        lag = _period_length(period)
+        rows[period] = {
+            'IC Mean': ic_mean,
+            'IC Std.': ic_std,
+            'ICIR': ic_mean / ic_std,
+            'IC t-stat': ic_mean / ic_std * np.sqrt(ic.count()),
+            'IC Positive Rate': (ic > 0).sum() / ic.count(),
+            'Rank Autocorrelation': rank_autocorrelation(factor, lag).mean(),
+            'Top Quantile Turnover': top_quantile_turnover(factor, lag, quantiles).mean(),
+        }
+    return pd.DataFrame.from_dict(rows, orient='index', columns=SCREEN_COLUMNS).rename_axis('period')
+
+
+def screen_factors(factors, forward_returns: dict, quantiles: int = 5) -> pd.DataFrame:
+    """screen many factors on wide panels, without building the clean factor
+    data: rank IC, ICIR and turnover proxies only
+
+    Parameters
+    ----------
+    factors : dict or iterable
+        factor name to factor values (dates as index and assets as columns),
+        or (name, values) pairs such as a generator computing factors one at a
+        time
+    forward_returns : dict
+        period (5, '5D') to forward returns, dates as index and assets as
+        columns
+    quantiles : int
+        number of quantiles of the top quantile turnover
+
+    Returns
+    -------
+    pd.DataFrame
+        SCREEN_COLUMNS indexed by factor and period
+    """
+    if isinstance(factors, dict):
+        factors = factors.items()
+    summaries = {name: screen_factor(factor, forward_returns, quantiles) for name, factor in factors}
+    return pd.concat(summaries, names=['factor', 'period'])
+
+
+def wide_forward_returns(prices: pd.DataFrame, periods=(1, 5, 10)) -> dict:
+    """cumulative forward returns of each period
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        prices, dates as index and assets as columns
+    periods : sequence[int]
+        periods in number of dates
+
+    Returns
+    -------
+    dict
+        '<period>D' to forward returns, dates as index and assets as columns
+    """
+    return {'{}D'.format(period): _wide_forward_returns(prices, prices.index, period, True)
+            for period in periods}
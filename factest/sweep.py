@@ -0,0 +1,223 @@
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import itertools
+import logging
+import os
+
+import pandas as pd
+
+from .alphalens import performance as perf
+from .alphalens import utils
+from .alphalens.utils import MaxLossExceededError
+from .data_service.base_data import BaseDataSource
+from .factorcal.utils import calculate_factor
+from .utils import get_benchmark_code
+
+logger = logging.getLogger(__name__)
+
+SWEEP_FIELDS = ['universe', 'deal_method', 'period', 'quantile']
+
+
+def _hashable(value):
+    """grid values are used as index labels
+    """
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _periods(value) -> tuple:
+    """a 'period' grid value as a tuple of periods, a single period is a
+    one-tuple
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+def sweep_plan(grid: dict, defaults: dict) -> list:
+    """build the sweep execution plan
+
+    Cells are grouped so that each artefact is computed once: factor values
+    depend only on the universe, forward returns on the universe and deal
+    method (computed once for all the periods of the grid), clean factor data
+    on the periods and quantile
+
+    Parameters
+    ----------
+    grid : dict
+        sweep field to the sequence of values to test, fields not in the grid
+        take their value from 'defaults'. A 'period' value is a tuple of
+        periods or a single period
+    defaults : dict
+        sweep field to default value
+
+    Returns
+    -------
+    list
+        one task per universe: (universe, [(deal_method, [(period, quantile)])])
+    """
+    unknown = set(grid) - set(SWEEP_FIELDS)
+    if len(unknown) > 0:
+        raise KeyError('unknown sweep fields {}'.format(list(unknown)))
+
+    values = {field: list(grid.get(field, [defaults[field]])) for field in SWEEP_FIELDS}
+    values['period'] = [_periods(period) for period in values['period']]
+
+    plan = []
+    for universe in values['universe']:
+        deals = []
+        for deal_method in values['deal_method']:
+            cells = list(itertools.product(values['period'], values['quantile']))
+            deals.append((deal_method, cells))
+        plan.append((universe, deals))
+    return plan
+
+
+class _SweepRunner():
+    """run sweep cells on a data source. The factor values of the last
+    universe and the forward returns of the last deal method are kept, so
+    consecutive cells of the plan share them
+    """
+
+    def __init__(self, data: BaseDataSource, formula: str, data_key_words, all_periods,
+                 long_short, group_neutral, compact):
+        self.__data = data
+        self.__formula = formula
+        self.__data_key_words = data_key_words
+        self.__all_periods = all_periods
+        self.__long_short = long_short
+        self.__group_neutral = group_neutral
+        self.__compact = compact
+
+        self.__universe = None
+        self.__factors = None
+        self.__groupby = None
+        self.__deal_method = None
+        self.__forward_returns = None
+        self.__labels = None
+
+    def run(self, universe, deal_method, period, quantile):
+        """summary of one cell, None if it exceeds max_loss
+
+        Returns
+        -------
+        tuple
+            cell key and factor summary
+        """
+        if universe is not None and isinstance(universe, str) and universe != 'all':
+            universe = get_benchmark_code(universe)
+
+        if self.__factors is None or _hashable(universe) != _hashable(self.__universe):
+            if universe is not None:
+                self.__data.set_universe(universe)
+            self.__factors = calculate_factor(self.__data, self.__formula, self.__data_key_words)
+            self.__groupby = None
+            if self.__group_neutral and self.__data.INDUSTRY is not None:
+                self.__groupby = self.__data.INDUSTRY['factor']
+            self.__universe = universe
+            self.__forward_returns = None
+
+        if self.__forward_returns is None or deal_method != self.__deal_method:
+            if deal_method is not None:
+                self.__data.set_deal_method(deal_method)
+            # forward returns of all the periods, each cell takes its columns
+            self.__forward_returns = utils.compute_forward_returns(
+                self.__factors, self.__data.QUOTE, periods=self.__all_periods, filter_zscore=20)
+            self.__labels = dict(zip(self.__all_periods, self.__forward_returns.columns))
+            self.__deal_method = deal_method
+
+        columns = [self.__labels[p] for p in sorted(period)]
+        # the current universe of the data source when it is not swept
+        label = 'current' if universe is None else _hashable(universe)
+        key = (label, deal_method, _hashable(period), quantile)
+        try:
+            factor_data = utils.get_clean_factor(
+                self.__factors, self.__forward_returns[columns], groupby=self.__groupby,
+                quantiles=quantile, compact=self.__compact)
+        except MaxLossExceededError as e:
+            logger.warning('skip %s: %s', key, e)
+            return key, None
+        return key, perf.factor_summary(
+            factor_data, demeaned=self.__long_short, group_adjust=self.__group_neutral)
+
+
+# sweep runner of the worker process, on its own copy of the data source
+_worker_runner = None
+
+
+def _init_sweep_worker(*args):
+    global _worker_runner
+    _worker_runner = _SweepRunner(*args)
+
+
+def _run_sweep_cell(cell):
+    return _worker_runner.run(*cell)
+
+
+def run_sweep(data: BaseDataSource, formula: str, data_key_words, grid: dict, defaults: dict,
+              long_short=False, group_neutral=False, compact=False, processes=None) -> pd.DataFrame:
+    """run a parameter sweep, the cells of the plan are run in parallel on a
+    process pool. Each worker gets its own copy of the data source and is
+    given consecutive cells of the plan, which share the factor values and
+    forward returns
+
+    Parameters
+    ----------
+    data : BaseDataSource
+        data object, it is not modified
+    formula : str
+        factor formula
+    data_key_words :
+        data keywords sequence
+    grid : dict
+        sweep field ('universe', 'deal_method', 'period', 'quantile') to the
+        sequence of values to test
+    defaults : dict
+        sweep field to the value used when the field is not in the grid
+    long_short, group_neutral, compact : bool
+        see FactorTest
+    processes : int, optional
+        number of worker processes, by default one per CPU. With 1 process
+        (or a single cell) the sweep runs in the calling process
+
+    Returns
+    -------
+    pd.DataFrame
+        factor summary (see alphalens.performance.factor_summary) of every
+        cell, indexed by universe ('current' when the universe is not in the
+        grid), deal method, periods, quantile and period
+    """
+    plan = sweep_plan(grid, defaults)
+    cells = [(universe, deal_method, period, quantile)
+             for universe, deals in plan
+             for deal_method, deal_cells in deals
+             for period, quantile in deal_cells]
+    all_periods = sorted(set(p for _, _, period, _ in cells for p in period))
+    args = (formula, data_key_words, all_periods, long_short, group_neutral, compact)
+
+    if processes == 1 or len(cells) == 1:
+        if all(universe is None for universe, _ in plan):
+            # only the deal method changes, it is set back afterwards
+            deal_method = data.deal_method
+            try:
+                runner = _SweepRunner(data, *args)
+                outcomes = [runner.run(*cell) for cell in cells]
+            finally:
+                if data.deal_method != deal_method:
+                    data.set_deal_method(deal_method)
+        else:
+            runner = _SweepRunner(copy.deepcopy(data), *args)
+            outcomes = [runner.run(*cell) for cell in cells]
+    else:
+        # the data source is pickled, each worker changes its own copy
+        workers = processes or os.cpu_count() or 1
+        chunksize = -(-len(cells) // workers)
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_sweep_worker,
+                                 initargs=(data,) + args) as executor:
+            outcomes = list(executor.map(_run_sweep_cell, cells, chunksize=chunksize))
+
+    results = {key: summary for key, summary in outcomes if summary is not None}
+    if len(results) == 0:
+        return pd.DataFrame()
+    return pd.concat(results, names=SWEEP_FIELDS + ['forward_period'])
@@ -0,0 +1,184 @@
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _peak_rss() -> int:
+    """peak resident set size of the process in bytes, None if unknown
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Span():
+    """one timed stage: wall and CPU time, peak RSS growth and row count
+    """
+
+    def __init__(self, trace, name: str, category: str, depth: int, args: dict):
+        self.trace = trace
+        self.name = name
+        self.category = category
+        self.depth = depth
+        self.args = args
+        self.rows = None
+        self.start = None
+        self.wall = None
+        self.cpu = None
+        self.rss_delta = None
+        self.__peak_rss = None
+        self.__cpu_start = None
+
+    def __enter__(self):
+        self.__peak_rss = _peak_rss()
+        self.__cpu_start = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall = time.perf_counter() - self.start
+        self.cpu = time.process_time() - self.__cpu_start
+        if self.__peak_rss is not None:
+            self.rss_delta = _peak_rss() - self.__peak_rss
+        self.trace._close(self)
+        return False
+
+
+class _NoSpan():
+    """span used when tracing is off, records nothing
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Trace():
+    """timings of the stages of a factor test run, nested stages (formula
+    operators inside the factor calculation for instance) have a larger depth
+    """
+
+    def __init__(self):
+        self.__spans = []
+        self.__depth = 0
+        self.__origin = time.perf_counter()
+
+    def span(self, name: str, category: str = 'stage', **args) -> Span:
+        """context manager timing a stage
+
+        Parameters
+        ----------
+        name : str
+            stage name
+        category : str
+            'stage', 'operator' or 'data'
+        args :
+            extra values stored with the span
+
+        Returns
+        -------
+        Span
+            set its rows attribute to record the size of the stage output
+        """
+        span = Span(self, name, category, self.__depth, args)
+        self.__depth += 1
+        return span
+
+    def _close(self, span: Span):
+        self.__depth -= 1
+        self.__spans.append(span)
+
+    @property
+    def spans(self) -> list:
+        """finished spans, ordered by start time
+        """
+        return sorted(self.__spans, key=lambda span: span.start)
+
+    def clear(self):
+        self.__spans = []
+
+    def to_frame(self) -> pd.DataFrame:
+        """spans as a table
+
+        Returns
+        -------
+        pd.DataFrame
+            name, category, depth, start (seconds since the trace creation),
+            wall and cpu (seconds), rss_delta (bytes) and rows of each span
+        """
+        return pd.DataFrame(
+            [{'name': span.name, 'category': span.category, 'depth': span.depth,
+              'start': span.start - self.__origin, 'wall': span.wall, 'cpu': span.cpu,
+              'rss_delta': span.rss_delta, 'rows': span.rows} for span in self.spans],
+            columns=['name', 'category', 'depth', 'start', 'wall', 'cpu', 'rss_delta', 'rows'])
+
+    def to_chrome_trace(self) -> dict:
+        """spans in the Chrome trace event format (chrome://tracing, Perfetto)
+
+        Returns
+        -------
+        dict
+            json serializable trace
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = {'cpu_ms': span.cpu * 1e3, 'rss_delta': span.rss_delta, 'rows': span.rows}
+            args.update({k: str(v) for k, v in span.args.items()})
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': (span.start - self.__origin) * 1e6,
+                'dur': span.wall * 1e6,
+                'pid': pid,
+                'tid': 0,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        """write the Chrome trace json file
+
+        Parameters
+        ----------
+        path : str
+            file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def span(trace: Trace, name: str, category: str = 'stage', **args):
+    """trace.span(...), or a span recording nothing when trace is None
+    """
+    if trace is None:
+        return _NO_SPAN
+    return trace.span(name, category, **args)
+
+
+def rows(value) -> int:
+    """number of rows of a stage output, None if it has no length
+    """
+    try:
+        return len(value)
+    except TypeError:
+        return None
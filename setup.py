@@ -11,6 +11,7 @@ install_reqs = [
     'empyrical>=0.5.0',
     'statsmodels',
     'tables',
+    'pyarrow',
 ]
 
 setup(
@@ -28,5 +29,10 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     platforms="any",
-    install_requires=install_reqs
+    install_requires=install_reqs,
+    entry_points={
+        'console_scripts': [
+            'factest = factest.cli:main',
+        ],
+    },
 )